@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from upbitpy.signer import Signer
+import logging
+import time
+
+COUNT = 100000
+QUERY = {'market': 'KRW-BTC', 'side': 'bid', 'volume': '0.01', 'price': '10000000', 'ord_type': 'limit'}
+
+
+def bench(name, sign):
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        sign()
+    elapsed = time.perf_counter() - start
+    logging.info('{:<16} {:>10.0f} tokens/sec'.format(name, COUNT / elapsed))
+
+
+def main():
+    signer = Signer('access_key', 'secret')
+    bench('Signer', lambda: signer.sign(QUERY))
+
+    # 비교: 요청마다 pyjwt 로 payload 전체를 encode (pyjwt 가 설치되어 있는 경우)
+    try:
+        import jwt
+        import uuid
+        import hashlib
+        from upbitpy.signer import query_string
+
+        def pyjwt_sign():
+            payload = {
+                'access_key': 'access_key',
+                'nonce': str(uuid.uuid4()),
+                'query_hash': hashlib.sha512(query_string(QUERY).encode('utf-8')).hexdigest(),
+                'query_hash_alg': 'SHA512',
+            }
+            return jwt.encode(payload, 'secret', algorithm='HS256')
+        bench('pyjwt', pyjwt_sign)
+    except ImportError:
+        logging.info('pyjwt is not installed')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -10,8 +10,11 @@ setup(
     license='MIT',
     install_requires=[
         'requests==2.21.0',
-        'pyjwt==1.7.1',
     ],
+    extras_require={
+        'http2': ['httpx[http2]'],
+        'parquet': ['pyarrow'],
+    },
     python_requires='>=3',
     packages=find_packages(),
     zip_safe=False
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from upbitpy.account_cache import AccountCache
+import threading
+import unittest
+
+
+class FakeUpbit():
+    def __init__(self):
+        self.calls = {'get_accounts': 0, 'get_chance': 0}
+        self.krw = 100000.0
+
+    def get_accounts(self):
+        self.calls['get_accounts'] += 1
+        return [{'currency': 'KRW', 'balance': str(self.krw), 'locked': '0.0', 'avg_buy_price': '0'}]
+
+    def get_chance(self, market):
+        self.calls['get_chance'] += 1
+        return {'bid_fee': '0.0005', 'ask_fee': '0.0005', 'market': {'id': market},
+                'bid_account': {'currency': 'KRW', 'balance': str(self.krw), 'locked': '0.0'},
+                'ask_account': {'currency': 'BTC', 'balance': '0.0', 'locked': '0.0'}}
+
+    def order(self, market, side, volume, price):
+        if volume * price > self.krw:
+            raise Exception('insufficient_funds_bid')
+        return {'uuid': 'u1', 'market': market, 'side': side, 'locked': str(volume * price * 1.0005)}
+
+    def cancel_order(self, uuid):
+        return {'uuid': uuid, 'market': 'KRW-BTC', 'side': 'bid', 'locked': '10005.0'}
+
+
+class AccountCacheTest(unittest.TestCase):
+
+    def test_cached_until_ttl(self):
+        upbit = FakeUpbit()
+        cache = AccountCache(upbit, ttl=60)
+        cache.get_accounts()
+        cache.get_accounts()
+        cache.get_chance('KRW-BTC')
+        cache.get_chance('KRW-BTC')
+        self.assertEqual(upbit.calls, {'get_accounts': 1, 'get_chance': 1})
+
+    def test_order_updates_balance(self):
+        upbit = FakeUpbit()
+        cache = AccountCache(upbit, ttl=60)
+        cache.get_accounts()
+        cache.order('KRW-BTC', 'bid', 1, 10000)
+        chance = cache.get_chance('KRW-BTC')
+        self.assertAlmostEqual(float(chance['bid_account']['balance']), 89995)
+        self.assertAlmostEqual(float(chance['bid_account']['locked']), 10005)
+        cache.cancel_order('u1')
+        accounts = cache.get_accounts()
+        self.assertAlmostEqual(float(accounts[0]['balance']), 100000)
+        self.assertAlmostEqual(float(accounts[0]['locked']), 0)
+        self.assertEqual(upbit.calls['get_accounts'], 1)
+
+    def test_failed_order_invalidates(self):
+        upbit = FakeUpbit()
+        cache = AccountCache(upbit, ttl=60)
+        cache.get_accounts()
+        upbit.krw = 5000.0
+        with self.assertRaises(Exception):
+            cache.order('KRW-BTC', 'bid', 1, 10000)
+        self.assertAlmostEqual(float(cache.get_accounts()[0]['balance']), 5000)
+        self.assertEqual(upbit.calls['get_accounts'], 2)
+        self.assertEqual(cache.drift_count, 1)
+
+    def test_threads(self):
+        upbit = FakeUpbit()
+        upbit.krw = 1e9
+        cache = AccountCache(upbit, ttl=60)
+        cache.get_accounts()
+
+        def run():
+            for _ in range(100):
+                cache.order('KRW-BTC', 'bid', 1, 1000)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertAlmostEqual(float(cache.get_accounts()[0]['locked']), 400 * 1000.5, places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
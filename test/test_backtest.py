@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from upbitpy.backtest import SimulatedExchange, run_backtest, run_batch
+import unittest
+
+
+def candle(time, low, high, close):
+    return {'candle_date_time_utc': time, 'opening_price': close, 'high_price': high,
+            'low_price': low, 'trade_price': close, 'candle_acc_trade_volume': 1.0}
+
+
+CANDLES = {
+    'KRW-BTC': [
+        candle('2019-06-06T07:02:00', 9900, 10100, 10000),
+        candle('2019-06-06T07:01:00', 10000, 10200, 10100),
+        candle('2019-06-06T07:00:00', 10000, 10000, 10000),
+    ],
+}
+
+
+class BacktestTest(unittest.TestCase):
+
+    def test_order_fill_and_accounts(self):
+        exchange = SimulatedExchange({'KRW': 100000}, fee=0.001, markets=['KRW-BTC'])
+        ret = exchange.order('KRW-BTC', 'bid', 1, 10000)
+        self.assertEqual(ret['state'], 'wait')
+        chance = exchange.get_chance('KRW-BTC')
+        self.assertAlmostEqual(float(chance['bid_account']['locked']), 10010)
+
+        exchange.feed('KRW-BTC', candle('2019-06-06T07:00:00', 10050, 10100, 10080))
+        self.assertEqual(exchange.get_order(ret['uuid'])['state'], 'wait')
+        exchange.feed('KRW-BTC', candle('2019-06-06T07:01:00', 9990, 10100, 10000))
+        self.assertEqual(exchange.get_order(ret['uuid'])['state'], 'done')
+        accounts = {a['currency']: a for a in exchange.get_accounts()}
+        self.assertAlmostEqual(float(accounts['KRW']['balance']), 89990)
+        self.assertAlmostEqual(float(accounts['BTC']['balance']), 1)
+        self.assertAlmostEqual(float(accounts['BTC']['avg_buy_price']), 10000)
+
+    def test_order_validation(self):
+        exchange = SimulatedExchange({'KRW': 10000}, markets=['KRW-BTC'])
+        with self.assertRaises(Exception):
+            exchange.order('KRW-BTC', 'bid', 1, 10001)
+        with self.assertRaises(Exception):
+            exchange.order('KRW-BTC', 'bid', 2, 10000)
+        with self.assertRaises(Exception):
+            exchange.order('KRW-ETH', 'bid', 1, 10000)
+
+    def test_cancel_order(self):
+        exchange = SimulatedExchange({'KRW': 100000})
+        ret = exchange.order('KRW-BTC', 'bid', 1, 10000)
+        exchange.cancel_order(ret['uuid'])
+        self.assertEqual(exchange.get_orders('KRW-BTC', 'cancel')[0]['uuid'], ret['uuid'])
+        self.assertAlmostEqual(exchange.total_value(), 100000)
+
+    def test_run_backtest(self):
+        seen = []
+
+        def strategy(exchange, market, candle):
+            seen.append(candle['candle_date_time_utc'])
+            if len(exchange.get_orders(market, 'wait')) == 0 and len(seen) == 1:
+                exchange.order(market, 'bid', 1, 10000)
+
+        exchange = run_backtest(strategy, CANDLES, {'KRW': 100000}, fee=0)
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(exchange.get_orders('KRW-BTC', 'done')), 1)
+        self.assertAlmostEqual(exchange.total_value(), 100000)
+
+    def test_run_batch(self):
+        def factory(price):
+            def strategy(exchange, market, candle):
+                if candle['candle_date_time_utc'] == '2019-06-06T07:00:00':
+                    exchange.order(market, 'bid', 1, price)
+            return strategy
+
+        results = run_batch(factory, CANDLES, [9900, 9800], {'KRW': 100000}, fee=0)
+        filled = [len(exchange.get_orders('KRW-BTC', 'done')) for _, exchange in results]
+        self.assertEqual(filled, [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from upbitpy.candle_index import CandleIndex, parse_to
+from datetime import datetime
+import unittest
+
+
+def candle(time, price, volume=1.0):
+    return {'market': 'KRW-BTC', 'candle_date_time_utc': time, 'opening_price': price,
+            'high_price': price, 'low_price': price, 'trade_price': price,
+            'candle_acc_trade_price': price * volume, 'candle_acc_trade_volume': volume, 'unit': 1}
+
+
+class FakeUpbit():
+    def get_minutes_candles(self, unit, market, to=None, count=None):
+        return [candle('2019-06-06T07:04:00', 130), candle('2019-06-06T07:01:00', 110)]
+
+
+class CandleIndexTest(unittest.TestCase):
+
+    def test_parse_to(self):
+        self.assertEqual(parse_to('2019-06-06T16:00:00+09:00'), datetime(2019, 6, 6, 7, 0))
+        self.assertEqual(parse_to('2019-06-06 07:00:00'), datetime(2019, 6, 6, 7, 0))
+        self.assertEqual(parse_to('2019-06-06T07:00:00Z'), datetime(2019, 6, 6, 7, 0))
+
+    def test_dense_fills_no_trade_minutes(self):
+        index = CandleIndex()
+        index.add('KRW-BTC', 1, [candle('2019-06-06T07:03:00', 120), candle('2019-06-06T07:00:00', 100)])
+        times, candles = index.dense('KRW-BTC', 1)
+        self.assertEqual(len(times), 4)
+        self.assertEqual([c['trade_price'] for c in candles], [100, 100, 100, 120])
+        self.assertEqual([c.get('filled', False) for c in candles], [False, True, True, False])
+        self.assertEqual(candles[1]['candle_acc_trade_volume'], 0.0)
+        self.assertEqual(candles[2]['candle_date_time_utc'], '2019-06-06T07:02:00')
+        self.assertEqual(index.gaps('KRW-BTC', 1), [])
+
+    def test_gaps_between_fetched_ranges(self):
+        index = CandleIndex()
+        index.add('KRW-BTC', 1, [candle('2019-06-06T07:01:00', 110), candle('2019-06-06T07:00:00', 100)])
+        index.add('KRW-BTC', 1, [candle('2019-06-06T07:05:00', 150)], to='2019-06-06T07:06:00Z')
+        self.assertEqual(index.gaps('KRW-BTC', 1),
+                         [(datetime(2019, 6, 6, 7, 2), datetime(2019, 6, 6, 7, 5))])
+        _, candles = index.dense('KRW-BTC', 1)
+        self.assertEqual(candles[2:5], [None, None, None])
+
+    def test_fetch_and_align(self):
+        index = CandleIndex()
+        index.fetch(FakeUpbit(), 'KRW-BTC', 1, to='2019-06-06T07:05:00Z', count=2)
+        index.add('KRW-ETH', 1, [candle('2019-06-06T07:03:00', 10)], to='2019-06-06T07:05:00Z')
+        times, aligned = index.align(['KRW-BTC', 'KRW-ETH'], 1)
+        self.assertEqual(times[0], datetime(2019, 6, 6, 7, 1))
+        self.assertEqual(len(times), 4)
+        self.assertEqual([c['trade_price'] for c in aligned['KRW-BTC']], [110, 110, 110, 130])
+        self.assertEqual([c and c['trade_price'] for c in aligned['KRW-ETH']], [None, None, 10, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
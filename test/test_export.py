@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from upbitpy.export import export_minutes_candles, export_trades_ticks, iter_minutes_candles
+import csv
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class FakeUpbit():
+    def __init__(self, minutes=25, fail_after=None):
+        self.candles = [{'candle_date_time_utc': '2019-06-06T07:%02d:00' % m, 'trade_price': m}
+                        for m in reversed(range(minutes))]
+        self.ticks = [{'sequential_id': i, 'trade_price': i} for i in reversed(range(7))]
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def get_minutes_candles(self, unit, market, to=None, count=None):
+        self._call()
+        candles = self.candles
+        if to is not None:
+            candles = [c for c in candles if c['candle_date_time_utc'] + 'Z' < to]
+        return candles[:count]
+
+    def get_trades_ticks(self, market, to=None, count=None, cursor=None):
+        self._call()
+        ticks = self.ticks
+        if cursor is not None:
+            ticks = [t for t in ticks if t['sequential_id'] < int(cursor)]
+        return ticks[:count]
+
+    def _call(self):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise Exception('network error')
+
+
+def read_rows(directory):
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, 'part-*.csv'))):
+        with open(path) as f:
+            rows += list(csv.DictReader(f))
+    return rows
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iter_minutes_candles_since(self):
+        candles = list(iter_minutes_candles(FakeUpbit(), 1, 'KRW-BTC', since='2019-06-06T07:10:00', count=4))
+        self.assertEqual([c['trade_price'] for c in candles], list(reversed(range(10, 25))))
+
+    def test_export_candles_in_parts(self):
+        rows = export_minutes_candles(FakeUpbit(), 1, 'KRW-BTC', self.directory,
+                                      batch_size=3, batches_per_part=2)
+        self.assertEqual(rows, 25)
+        self.assertEqual(len(glob.glob(os.path.join(self.directory, 'part-*.csv'))), 5)
+        self.assertEqual([int(r['trade_price']) for r in read_rows(self.directory)],
+                         list(reversed(range(25))))
+
+    def test_export_resume(self):
+        with self.assertRaisesRegex(Exception, 'network error'):
+            export_trades_ticks(FakeUpbit(fail_after=2), 'KRW-BTC', self.directory,
+                                batch_size=2, batches_per_part=1, count=2)
+        self.assertEqual(len(read_rows(self.directory)), 4)
+        rows = export_trades_ticks(FakeUpbit(), 'KRW-BTC', self.directory,
+                                   batch_size=2, batches_per_part=1, count=2)
+        self.assertEqual(rows, 7)
+        self.assertEqual([int(r['sequential_id']) for r in read_rows(self.directory)],
+                         list(reversed(range(7))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from upbitpy.indicators import EMA, RSI, Bollinger, VWAP, MarketIndicators, IndicatorSet
+import math
+import unittest
+
+
+def candle(market, minute, price, volume=1.0, day='2019-06-06'):
+    return {'market': market, 'candle_date_time_utc': '%sT07:%02d:00' % (day, minute),
+            'high_price': price, 'low_price': price, 'trade_price': price,
+            'candle_acc_trade_volume': volume}
+
+
+def ticker(market, minute, price, acc_price, acc_volume, second=0):
+    # 2019-06-06T07:<minute>:<second> UTC
+    return {'market': market, 'trade_price': price, 'trade_volume': 0.001,
+            'trade_timestamp': (1559804400 + minute * 60 + second) * 1000,
+            'acc_trade_price': acc_price, 'acc_trade_volume': acc_volume}
+
+
+class IndicatorsTest(unittest.TestCase):
+
+    def test_ema(self):
+        ema = EMA(3)
+        self.assertIsNone(ema.warmup([1, 2]))
+        self.assertAlmostEqual(ema.update(3), 2)
+        self.assertAlmostEqual(ema.update(6), 4)
+
+    def test_rsi(self):
+        rsi = RSI(3)
+        self.assertIsNone(rsi.warmup([10, 11, 12]))
+        self.assertAlmostEqual(rsi.update(11), 100 - 100 / (1 + 2))
+        self.assertAlmostEqual(RSI(2).warmup([1, 2, 3, 4]), 100)
+
+    def test_bollinger_matches_full_recompute(self):
+        prices = [100 + (i * 7) % 13 for i in range(50)]
+        bollinger = Bollinger(20, 2)
+        bollinger.warmup(prices)
+        window = prices[-20:]
+        mean = sum(window) / 20.0
+        std = math.sqrt(sum((p - mean) ** 2 for p in window) / 20.0)
+        lower, middle, upper = bollinger.value
+        self.assertAlmostEqual(middle, mean)
+        self.assertAlmostEqual(upper, mean + 2 * std)
+        self.assertAlmostEqual(lower, mean - 2 * std)
+
+    def test_vwap(self):
+        vwap = VWAP()
+        vwap.update(100, 1)
+        self.assertAlmostEqual(vwap.update(200, 3), 175)
+
+    def test_indicator_set(self):
+        indicators = IndicatorSet(ema_period=2, rsi_period=2, bollinger_period=2)
+        values = indicators.warmup({'KRW-BTC': [candle('KRW-BTC', 1, 20), candle('KRW-BTC', 0, 10)]})
+        self.assertAlmostEqual(values['KRW-BTC']['ema'], 15)
+        values = indicators.update_candles([candle('KRW-BTC', 2, 30), candle('KRW-ETH', 2, 5),
+                                            candle('KRW-BTC', 0, 99)])
+        self.assertAlmostEqual(values['KRW-BTC']['ema'], 25)
+        self.assertAlmostEqual(values['KRW-BTC']['vwap'], 20)
+        self.assertIsNone(values['KRW-ETH']['ema'])
+
+        values = indicators.update_candles([candle('KRW-BTC', 0, 40, day='2019-06-07')])
+        self.assertAlmostEqual(values['KRW-BTC']['vwap'], 40)
+
+        values = indicators.update_tickers([ticker('KRW-ETH', 3, 7, 70, 10)])
+        values = indicators.update_tickers([ticker('KRW-ETH', 3, 7, 70, 10)])
+        self.assertAlmostEqual(values['KRW-ETH']['ema'], 6)
+
+    def test_forming_candle_replaces_last_update(self):
+        forming = MarketIndicators(ema_period=2, rsi_period=2, bollinger_period=2)
+        closed = MarketIndicators(ema_period=2, rsi_period=2, bollinger_period=2)
+        forming.warmup([candle('KRW-BTC', 0, 10), candle('KRW-BTC', 1, 20)])
+        closed.warmup([candle('KRW-BTC', 0, 10), candle('KRW-BTC', 1, 20)])
+        forming.update_candle(candle('KRW-BTC', 2, 100, volume=1.0))
+        values = forming.update_candle(candle('KRW-BTC', 2, 200, volume=2.0))
+        self.assertEqual(values, closed.update_candle(candle('KRW-BTC', 2, 200, volume=2.0)))
+        self.assertAlmostEqual(values['ema'], 15 + 2.0 / 3 * 185)
+        self.assertEqual(list(forming.bollinger._window), [20, 200])
+
+        # 이전 시각의 캔들은 무시한다.
+        self.assertEqual(forming.update_candle(candle('KRW-BTC', 1, 999)), values)
+
+    def test_ticker_vwap_uses_accumulated_trades(self):
+        indicators = MarketIndicators()
+        indicators.update_ticker(ticker('KRW-BTC', 0, 100, 1000, 10))
+        # 두 폴링 사이의 체결(거래량 10, 거래대금 1500)은 trade_volume 에 없다.
+        values = indicators.update_ticker(ticker('KRW-BTC', 5, 90, 2500, 20))
+        self.assertAlmostEqual(values['vwap'], 2500 / 20.0)
+
+    def test_ticker_updates_forming_candle(self):
+        polled = MarketIndicators(ema_period=2, rsi_period=2, bollinger_period=2)
+        closed = MarketIndicators(ema_period=2, rsi_period=2, bollinger_period=2)
+        polled.warmup([candle('KRW-BTC', 0, 10), candle('KRW-BTC', 1, 20)])
+        closed.warmup([candle('KRW-BTC', 0, 10), candle('KRW-BTC', 1, 20)])
+        for second, price in enumerate([50, 80, 200]):
+            values = polled.update_ticker(ticker('KRW-BTC', 2, price, 0, 0, second=second * 10))
+        # 같은 분의 현재가는 캔들 하나로 반영되어 period 가 캔들 개수로 유지된다.
+        self.assertEqual(values['ema'], closed.update_candle(candle('KRW-BTC', 2, 200))['ema'])
+        self.assertEqual(list(polled.bollinger._window), [20, 200])
+
+        values = polled.update_ticker(ticker('KRW-BTC', 3, 110, 0, 0))
+        self.assertEqual(list(polled.bollinger._window), [200, 110])
+        self.assertEqual(values['ema'], closed.update_candle(candle('KRW-BTC', 3, 110))['ema'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from upbitpy.ledger import Ledger
+import unittest
+
+
+def transfer(uuid, currency, amount, created_at, state, fee='0'):
+    return {'uuid': uuid, 'currency': currency, 'amount': amount, 'fee': fee,
+            'created_at': created_at, 'state': state}
+
+
+def order(uuid, side, price, volume, created_at, fee='0', state='done', ord_type='limit', funds=None):
+    if funds is None:
+        funds = float(price) * float(volume)
+    return {'uuid': uuid, 'market': 'KRW-BTC', 'side': side, 'ord_type': ord_type, 'state': state, 'price': price,
+            'executed_volume': volume, 'paid_fee': fee, 'created_at': created_at,
+            'trades': [{'funds': str(funds / 2)}, {'funds': str(funds / 2)}] if float(volume) > 0 else []}
+
+
+class FakeUpbit():
+    def __init__(self):
+        self.deposits = [transfer('d1', 'KRW', '100000', '2019-06-01T00:00:00+09:00', 'accepted')]
+        self.withdraws = [transfer('w1', 'KRW', '1000', '2019-06-04T00:00:00+09:00', 'done', fee='100')]
+        self.orders = [order('o2', 'ask', '12000', '1', '2019-06-03T00:00:00+09:00', fee='6'),
+                       order('o1', 'bid', '10000', '2', '2019-06-02T00:00:00+09:00', fee='10')]
+        self.pages = []
+        self.order_limit = 100
+        self.order_lookups = []
+
+    def get_deposits(self, currency=None, limit=None, page=None, order_by=None):
+        return self._page('deposits', sorted(self.deposits, key=lambda r: r['created_at'], reverse=True),
+                          limit, page)
+
+    def get_withraws(self, currency, state, limit, page=None, order_by=None):
+        return self._page('withdraws', self.withdraws, limit, page)
+
+    def get_orders(self, market, state, page=1, order_by='asc'):
+        # 주문 리스트 응답에는 체결 내역(trades)이 없다.
+        orders = sorted([dict((k, v) for k, v in o.items() if k != 'trades') for o in self.orders
+                         if o['state'] == state], key=lambda o: o['created_at'], reverse=True)
+        return self._page('orders', orders, self.order_limit, page)
+
+    def get_order(self, uuid):
+        self.order_lookups.append(uuid)
+        return [o for o in self.orders if o['uuid'] == uuid][0]
+
+    def _page(self, kind, records, limit, page):
+        self.pages.append((kind, page))
+        return records[(page - 1) * limit:page * limit]
+
+
+class LedgerTest(unittest.TestCase):
+
+    def test_sync_and_balance(self):
+        upbit = FakeUpbit()
+        ledger = Ledger(upbit)
+        self.assertEqual(ledger.sync(['KRW'], ['KRW-BTC']), 4)
+        self.assertAlmostEqual(ledger.balance('KRW'), 100000 - 20010 + 11994 - 1100)
+        self.assertAlmostEqual(ledger.balance('BTC'), 1)
+        self.assertAlmostEqual(ledger.balance('KRW', at='2019-06-02T00:00:00+09:00'), 100000 - 20010)
+        history = ledger.balance_history('KRW')
+        self.assertEqual([h[0][:10] for h in history],
+                         ['2019-06-01', '2019-06-02', '2019-06-03', '2019-06-04'])
+        self.assertAlmostEqual(history[-1][2], ledger.balance('KRW'))
+        self.assertAlmostEqual(ledger.realized_pnl('KRW-BTC'), 11994 - 10005)
+
+    def test_incremental_sync(self):
+        upbit = FakeUpbit()
+        ledger = Ledger(upbit)
+        ledger.PAGE_LIMIT = 1
+        upbit.deposits.append(transfer('d0', 'KRW', '5', '2019-05-01T00:00:00+09:00', 'accepted'))
+        self.assertEqual(ledger.sync_deposits('KRW'), 2)
+        upbit.deposits.append(transfer('d2', 'KRW', '7', '2019-06-05T00:00:00+09:00', 'processing'))
+        upbit.pages = []
+        self.assertEqual(ledger.sync_deposits('KRW'), 1)
+        self.assertEqual(upbit.pages, [('deposits', 1), ('deposits', 2)])
+        self.assertAlmostEqual(ledger.balance('KRW'), 100005)
+
+        upbit.deposits[-1]['state'] = 'accepted'
+        self.assertEqual(ledger.sync_deposits('KRW'), 0)
+        self.assertAlmostEqual(ledger.balance('KRW'), 100012)
+
+    def test_old_open_order_filled_later(self):
+        upbit = FakeUpbit()
+        upbit.order_limit = 1
+        upbit.orders = [order('o1', 'bid', '10000', '1', '2019-06-01T00:00:00+09:00', state='wait'),
+                        order('o2', 'bid', '10000', '1', '2019-06-02T00:00:00+09:00'),
+                        order('o3', 'bid', '10000', '1', '2019-06-03T00:00:00+09:00')]
+        ledger = Ledger(upbit)
+        ledger.PAGE_LIMIT = 1
+        ledger.sync_orders('KRW-BTC')
+        upbit.orders[0]['state'] = 'done'
+        upbit.orders.append(order('o4', 'bid', '10000', '1', '2019-06-04T00:00:00+09:00'))
+        self.assertEqual(ledger.sync_orders('KRW-BTC'), 1)
+        self.assertAlmostEqual(ledger.balance('BTC'), 4.0)
+
+    def test_executed_funds(self):
+        upbit = FakeUpbit()
+        upbit.orders = [
+            # 10000 에 주문했지만 9990 에 체결
+            order('o1', 'bid', '10000', '2', '2019-06-02T00:00:00+09:00', fee='9.99', funds=19980),
+            # 시장가 매수: price 는 주문 총액
+            order('o2', 'bid', '5000', '0.5', '2019-06-03T00:00:00+09:00', fee='2.5', ord_type='price',
+                  funds=5000),
+            # 시장가 매도: price 없음
+            order('o3', 'ask', None, '1.5', '2019-06-04T00:00:00+09:00', fee='7.5', ord_type='market',
+                  funds=15000),
+        ]
+        ledger = Ledger(upbit)
+        ledger.sync_orders('KRW-BTC')
+        self.assertEqual(sorted(upbit.order_lookups), ['o1', 'o2', 'o3'])
+        self.assertAlmostEqual(ledger.balance('KRW'), -(19980 + 9.99) - (5000 + 2.5) + (15000 - 7.5))
+        self.assertAlmostEqual(ledger.balance('BTC'), 1.0)
+        cost = 19980 + 9.99 + 5000 + 2.5
+        self.assertAlmostEqual(ledger.realized_pnl('KRW-BTC'), 15000 - 7.5 - cost / 2.5 * 1.5)
+        self.assertEqual(ledger._db.execute('SELECT ord_type FROM orders WHERE uuid = ?', ('o2',)).fetchone()[0],
+                         'price')
+
+        # 체결량이 그대로인 주문은 다시 조회하지 않는다.
+        upbit.order_lookups = []
+        ledger._db.execute('DELETE FROM watermarks')
+        ledger.sync_orders('KRW-BTC')
+        self.assertEqual(upbit.order_lookups, [])
+
+    def test_executed_funds_in_list_response(self):
+        upbit = FakeUpbit()
+        upbit.orders = [order('o1', 'bid', '10000', '2', '2019-06-02T00:00:00+09:00', funds=19980)]
+        upbit.orders[0]['executed_funds'] = '19980'
+        ledger = Ledger(upbit)
+        ledger.sync_orders('KRW-BTC')
+        self.assertEqual(upbit.order_lookups, [])
+        self.assertAlmostEqual(ledger.balance('KRW'), -19980)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from upbitpy import Upbitpy, MemoryTransport
+from upbitpy.scheduler import RequestScheduler, classify, PRIORITY_CANCEL, PRIORITY_ORDER, PRIORITY_QUOTATION
+from upbitpy.transport import TransportResponse
+import threading
+import time
+import unittest
+
+
+class BlockingTransport():
+    def __init__(self):
+        self.order = []
+        self.release = threading.Event()
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        self.order.append((method, url, (params or data or {}).get('market')))
+        self.release.wait()
+        return TransportResponse(200, '[]')
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def test_classify(self):
+        self.assertEqual(classify('DELETE', 'https://api.upbit.com/v1/order'), (PRIORITY_CANCEL, 'default'))
+        self.assertEqual(classify('POST', 'https://api.upbit.com/v1/orders'), (PRIORITY_ORDER, 'order'))
+        self.assertEqual(classify('GET', 'https://api.upbit.com/v1/candles/minutes/1'),
+                         (PRIORITY_QUOTATION, 'candles'))
+        self.assertEqual(classify('GET', 'https://api.upbit.com/v1/orderbook?'), (PRIORITY_QUOTATION, 'orderbook'))
+
+    def test_cancel_preempts_quotation(self):
+        transport = BlockingTransport()
+        scheduler = RequestScheduler(transport, max_concurrency=1)
+        candles = 'https://api.upbit.com/v1/candles/minutes/1'
+        threads = [threading.Thread(target=scheduler.request, args=('GET', candles),
+                                    kwargs={'params': {'market': 'KRW-BTC'}})]
+        threads[0].start()
+        time.sleep(0.05)
+        for _ in range(3):
+            threads.append(threading.Thread(target=scheduler.request, args=('GET', candles),
+                                            kwargs={'params': {'market': 'KRW-BTC'}}))
+        threads.append(threading.Thread(target=scheduler.request, args=('GET', candles),
+                                        kwargs={'params': {'market': 'KRW-ETH'}}))
+        threads.append(threading.Thread(target=scheduler.request, args=('DELETE', 'https://api.upbit.com/v1/order'),
+                                        kwargs={'data': {'uuid': 'u1'}}))
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.05)
+        transport.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(transport.order[1][0], 'DELETE')
+        self.assertEqual(transport.order[2][2], 'KRW-ETH')
+
+    def test_burst_alternates_markets(self):
+        transport = BlockingTransport()
+        scheduler = RequestScheduler(transport, max_concurrency=1)
+        candles = 'https://api.upbit.com/v1/candles/minutes/1'
+        threads = []
+        for market in ['KRW-XRP'] + ['KRW-BTC'] * 5 + ['KRW-ETH']:
+            t = threading.Thread(target=scheduler.request, args=('GET', candles),
+                                 kwargs={'params': {'market': market}})
+            t.start()
+            threads.append(t)
+            time.sleep(0.02)
+        transport.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual([market for _, _, market in transport.order[1:]],
+                         ['KRW-BTC', 'KRW-ETH', 'KRW-BTC', 'KRW-BTC', 'KRW-BTC', 'KRW-BTC'])
+
+    def test_rate_limit(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/ticker', [])
+        scheduler = RequestScheduler(transport, limits={'ticker': 3})
+        start = time.monotonic()
+        for _ in range(4):
+            scheduler.request('GET', 'https://api.upbit.com/v1/ticker', params={'markets': 'KRW-BTC'})
+        self.assertGreater(time.monotonic() - start, 0.9)
+
+    def test_remaining_req_header(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/ticker', [],
+                               headers={'Remaining-Req': 'group=ticker; min=500; sec=0'})
+        scheduler = RequestScheduler(transport)
+        scheduler.request('GET', 'https://api.upbit.com/v1/ticker')
+        self.assertGreater(scheduler._budget_wait('ticker'), 0)
+
+    def test_remaining_req_minute_budget(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/orders', {}, method='POST',
+                               headers={'Remaining-Req': 'group=order; min=0; sec=7'})
+        scheduler = RequestScheduler(transport)
+        scheduler.request('POST', 'https://api.upbit.com/v1/orders', data={'market': 'KRW-BTC'})
+        self.assertGreater(scheduler._budget_wait('order'), 1.0)
+
+    def test_minute_limit(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/ticker', [])
+        scheduler = RequestScheduler(transport, minute_limits={'ticker': 2})
+        for _ in range(2):
+            scheduler.request('GET', 'https://api.upbit.com/v1/ticker', params={'markets': 'KRW-BTC'})
+        self.assertEqual(scheduler._window('ticker')[1], 2)
+        self.assertGreater(scheduler._budget_wait('ticker'), 1.0)
+
+    def test_scheduled_client(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/market/all', [{'market': 'KRW-BTC'}])
+        upbit = Upbitpy(transport=transport, scheduled=True)
+        self.assertIsInstance(upbit.transport, RequestScheduler)
+        self.assertEqual(upbit.markets, ['KRW-BTC'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from upbitpy import Upbitpy, MemoryTransport
+from upbitpy.signer import Signer, query_string
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import hmac
+import json
+import unittest
+
+
+def decode(token):
+    def b64decode(data):
+        return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+    header, payload, signature = token.split('.')
+    return json.loads(b64decode(header)), json.loads(b64decode(payload)), b64decode(signature)
+
+
+class SignerTest(unittest.TestCase):
+
+    def test_token(self):
+        token = Signer('access', 'secret').sign()
+        header, payload, signature = decode(token)
+        self.assertEqual(header, {'alg': 'HS256', 'typ': 'JWT'})
+        self.assertEqual(payload['access_key'], 'access')
+        self.assertNotIn('query_hash', payload)
+        signing_input = token.rsplit('.', 1)[0].encode('ascii')
+        self.assertEqual(signature, hmac.new(b'secret', signing_input, hashlib.sha256).digest())
+
+    def test_query_hash(self):
+        query = {'state': 'done', 'uuids[]': ['a', 'b']}
+        self.assertEqual(query_string(query), 'state=done&uuids[]=a&uuids[]=b')
+        _, payload, _ = decode(Signer('access', 'secret').sign(query))
+        self.assertEqual(payload['query_hash_alg'], 'SHA512')
+        self.assertEqual(payload['query_hash'],
+                         hashlib.sha512(b'state=done&uuids[]=a&uuids[]=b').hexdigest())
+
+    def test_unique_nonce(self):
+        signer = Signer('access', 'secret')
+        with ThreadPoolExecutor(8) as executor:
+            tokens = list(executor.map(lambda _: signer.sign({'market': 'KRW-BTC'}), range(2000)))
+        self.assertEqual(len(set(decode(t)[1]['nonce'] for t in tokens)), 2000)
+
+    def test_client_headers(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/market/all', [{'market': 'KRW-BTC'}])
+        transport.add_response('https://api.upbit.com/v1/orders/chance', {})
+        upbit = Upbitpy('access', 'secret', transport=transport)
+        upbit.get_chance('KRW-BTC')
+        token = transport.requests[-1]['headers']['Authorization'].split(' ')[1]
+        self.assertEqual(decode(token)[1]['query_hash'], hashlib.sha512(b'market=KRW-BTC').hexdigest())
+        with self.assertRaises(Exception):
+            Upbitpy(transport=transport).get_accounts()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from upbitpy import Upbitpy, MemoryTransport
+from upbitpy.snapshot import Snapshot, related_markets, take_snapshot
+import time
+import unittest
+
+MARKETS = ['KRW-BTC', 'KRW-XRP', 'BTC-XRP', 'KRW-ADA', 'BTC-ETH', 'USDT-BTC', 'USDT-XRP']
+PRICES = {'KRW-BTC': 10000000, 'KRW-XRP': 505, 'BTC-XRP': 0.00005, 'USDT-BTC': 8000, 'USDT-XRP': 0.4}
+
+
+def ticker(market, price):
+    return {'market': market, 'trade_price': price, 'trade_timestamp': int(time.time() * 1000)}
+
+
+def orderbook(market, price):
+    return {'market': market, 'orderbook_units': [{'ask_price': price * 1.01, 'bid_price': price * 0.99}]}
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MemoryTransport()
+        self.transport.add_response('https://api.upbit.com/v1/market/all', [{'market': m} for m in MARKETS])
+        self.transport.add_response('https://api.upbit.com/v1/ticker',
+                                    [ticker(m, p) for m, p in PRICES.items()])
+        self.transport.add_response('https://api.upbit.com/v1/orderbook?',
+                                    [orderbook(m, p) for m, p in PRICES.items()])
+        self.upbit = Upbitpy(transport=self.transport)
+
+    def test_related_markets(self):
+        self.assertEqual(related_markets(MARKETS),
+                         ['BTC-XRP', 'KRW-BTC', 'KRW-XRP', 'USDT-BTC', 'USDT-XRP'])
+
+    def test_take_snapshot(self):
+        snapshot = take_snapshot(self.upbit, orderbook=True)
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual(self.transport.requests[1]['params']['markets'],
+                         'BTC-XRP,KRW-BTC,KRW-XRP,USDT-BTC,USDT-XRP')
+        self.assertLessEqual(snapshot.started_at, snapshot.captured_at)
+        self.assertLess(snapshot.staleness('KRW-XRP'), 5)
+        self.assertAlmostEqual(snapshot.price('KRW-XRP'), 505)
+
+        rates = dict(((r['quote'], r['via'], r['base']), r) for r in snapshot.cross_rates())
+        self.assertAlmostEqual(rates[('KRW', 'BTC', 'XRP')]['implied'], 500)
+        self.assertAlmostEqual(rates[('KRW', 'BTC', 'XRP')]['premium'], 0.01)
+        self.assertAlmostEqual(rates[('BTC', 'KRW', 'XRP')]['implied'], 505 / 10000000.0)
+        self.assertAlmostEqual(rates[('USDT', 'BTC', 'XRP')]['implied'], 0.4)
+        self.assertNotIn(('KRW', 'USDT', 'XRP'), rates)
+
+    def test_cross_rate_staleness_includes_cross_market(self):
+        tickers = dict((m, {'market': m, 'trade_price': p, 'trade_timestamp': 100000}) for m, p in PRICES.items())
+        tickers['KRW-BTC']['trade_timestamp'] = 40000
+        snapshot = Snapshot(tickers, {}, 100.0, 100.0)
+        rates = dict(((r['quote'], r['via'], r['base']), r) for r in snapshot.cross_rates())
+        self.assertAlmostEqual(rates[('KRW', 'BTC', 'XRP')]['staleness'], 60)
+        self.assertAlmostEqual(rates[('BTC', 'KRW', 'XRP')]['staleness'], 60)
+        self.assertAlmostEqual(rates[('USDT', 'BTC', 'XRP')]['staleness'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
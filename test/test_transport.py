@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from upbitpy import Upbitpy, Http2Transport, MemoryTransport, RecordingTransport, ReplayTransport, RequestsTransport
+from upbitpy.transport import TransportResponse, get_transport, read_records
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class FakeTransport():
+    MARKETS = [{'market': 'KRW-BTC'}, {'market': 'KRW-ETH'}]
+
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        self.calls += 1
+        if url.endswith('/market/all'):
+            body = self.MARKETS
+        else:
+            body = [{'market': params['markets'], 'trade_price': self.calls}]
+        return TransportResponse(200, json.dumps(body),
+                                 {'Remaining-Req': 'group=market; min=599; sec=9'})
+
+
+class TransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'upbit.jsonl.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_record_and_replay(self):
+        recorder = RecordingTransport(self.path, FakeTransport())
+        upbit = Upbitpy('key', 'secret', transport=recorder)
+        first = upbit.get_ticker(['KRW-BTC'])
+        second = upbit.get_ticker(['KRW-BTC'])
+        recorder.close()
+
+        records = list(read_records(self.path))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[1]['remaining_req'], 'group=market; min=599; sec=9')
+
+        replay = ReplayTransport(self.path)
+        upbit = Upbitpy(transport=replay)
+        self.assertEqual(upbit.markets, ['KRW-BTC', 'KRW-ETH'])
+        self.assertEqual(upbit.get_ticker(['KRW-BTC']), first)
+        self.assertEqual(upbit.get_ticker(['KRW-BTC']), second)
+        self.assertEqual(replay.remaining(), 0)
+        self.assertIn('market', upbit.get_remaining_req())
+        with self.assertRaises(Exception):
+            upbit.get_ticker(['KRW-BTC'])
+
+    def test_memory_transport(self):
+        transport = MemoryTransport()
+        transport.add_response('https://api.upbit.com/v1/market/all', FakeTransport.MARKETS)
+        transport.add_response('https://api.upbit.com/v1/accounts', [{'currency': 'KRW'}])
+        transport.add_response('https://api.upbit.com/v1/accounts', [])
+        upbit = Upbitpy('key', 'secret', transport=transport)
+        self.assertEqual(upbit.get_accounts(), [{'currency': 'KRW'}])
+        self.assertEqual(upbit.get_accounts(), [])
+        self.assertEqual(upbit.get_accounts(), [])
+        self.assertEqual(len(transport.requests), 4)
+        self.assertIn('Authorization', transport.requests[1]['headers'])
+        with self.assertRaises(Exception):
+            upbit.get_ticker(['KRW-BTC'])
+
+    def test_http2_remaining_req(self):
+        try:
+            import httpx
+            transport = Http2Transport()
+        except Exception:
+            self.skipTest('httpx[http2] is not installed')
+
+        def handler(request):
+            body = FakeTransport.MARKETS if request.url.path == '/v1/market/all' else []
+            return httpx.Response(200, json=body, headers={'Remaining-Req': 'group=ticker; min=599; sec=9'})
+
+        transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+        upbit = Upbitpy(transport=transport)
+        upbit.get_ticker(['KRW-BTC'])
+        self.assertEqual(upbit.get_remaining_req()['ticker']['sec'], '9')
+
+    def test_get_transport(self):
+        self.assertIsInstance(get_transport('requests'), RequestsTransport)
+        transport = MemoryTransport()
+        self.assertIs(get_transport(transport), transport)
+        with self.assertRaises(Exception):
+            get_transport('invalid')
+
+    def test_crash_then_reopen(self):
+        # 첫 실행은 기록 하나를 flush 한 뒤 close() 없이 종료
+        code = '\n'.join([
+            'import os, sys',
+            'sys.path.insert(0, %r)' % os.path.dirname(os.path.abspath(__file__)),
+            'from test_transport import FakeTransport',
+            'from upbitpy import RecordingTransport',
+            'recorder = RecordingTransport(%r, FakeTransport())' % self.path,
+            'recorder.request("GET", "https://api.upbit.com/v1/market/all")',
+            'os._exit(0)',
+        ])
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        subprocess.check_call([sys.executable, '-c', code], env=env)
+
+        recorder = RecordingTransport(self.path, FakeTransport())
+        recorder.request('GET', 'https://api.upbit.com/v1/ticker', params={'markets': 'KRW-BTC'})
+        recorder.close()
+        self.assertEqual(recorder.segment_path, self.path + '.1')
+
+        records = list(read_records(self.path))
+        self.assertEqual([r['url'] for r in records],
+                         ['https://api.upbit.com/v1/market/all', 'https://api.upbit.com/v1/ticker'])
+        replay = ReplayTransport(self.path)
+        self.assertEqual(replay.remaining(), 2)
+
+    def test_secret_headers_not_recorded(self):
+        recorder = RecordingTransport(self.path, FakeTransport())
+        recorder.request('GET', 'https://api.upbit.com/v1/market/all',
+                         headers={'Authorization': 'Bearer token', 'Accept': 'application/json'})
+        recorder.close()
+        record = next(read_records(self.path))
+        self.assertEqual(record['headers'], {'Accept': 'application/json'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,13 @@
 from upbitpy.upbitpy import Upbitpy
+from upbitpy.transport import RequestsTransport, Http2Transport, MemoryTransport, RecordingTransport, ReplayTransport
+from upbitpy.scheduler import RequestScheduler
+from upbitpy.signer import Signer
+from upbitpy.backtest import SimulatedExchange, run_backtest, run_batch
+from upbitpy.candle_index import CandleIndex
+from upbitpy.export import export_minutes_candles, export_trades_ticks
+from upbitpy.account_cache import AccountCache
+from upbitpy.ledger import Ledger
+from upbitpy.indicators import EMA, RSI, Bollinger, VWAP, MarketIndicators, IndicatorSet
+from upbitpy.snapshot import Snapshot, take_snapshot
 
 __version__ = '1.0.0'
\ No newline at end of file
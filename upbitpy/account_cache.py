@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import copy
+import time
+import logging
+import threading
+
+
+class AccountCache():
+    '''
+    계좌/주문 가능 정보 캐시
+    get_accounts(), get_chance() 결과를 보관하고 order(), cancel_order() 결과로 잔고를 바로 갱신한다.
+    API 는 ttl 이 지났거나, 잔고가 맞지 않는 것이 감지되었거나(drift), invalidate() 를 호출했을 때만 다시 조회한다.
+    여러 thread 에서 같은 객체를 사용해도 된다.
+    '''
+
+    def __init__(self, upbit, ttl=5.0, chance_ttl=60.0):
+        '''
+        Constructor
+        :param upbit: Upbitpy
+        :param float ttl: 계좌 정보 유효 시간 (초)
+        :param float chance_ttl: 주문 가능 정보(수수료, 주문 제한) 유효 시간 (초)
+        '''
+        self.upbit = upbit
+        self.ttl = ttl
+        self.chance_ttl = chance_ttl
+        self.drift_count = 0
+        self._lock = threading.RLock()
+        self._accounts = None
+        self._accounts_time = 0
+        self._generation = 0
+        self._chances = dict()
+
+    ###############################################################
+    # EXCHANGE API
+    ###############################################################
+
+    def get_accounts(self):
+        '''
+        전체 계좌 조회
+        :return: json array
+        '''
+        with self._lock:
+            self._ensure_accounts()
+            return copy.deepcopy(list(self._accounts.values()))
+
+    def get_chance(self, market):
+        '''
+        주문 가능 정보
+        수수료, 주문 제한은 chance_ttl 동안 캐시하고, bid_account/ask_account 는 캐시된 계좌 정보로 채운다.
+        :param str market: Market ID
+        :return: json object
+        '''
+        with self._lock:
+            cached = self._chances.get(market)
+            if cached is None or time.time() - cached[1] > self.chance_ttl:
+                chance = self.upbit.get_chance(market)
+                self._chances[market] = (chance, time.time())
+            self._ensure_accounts()
+            chance = copy.deepcopy(self._chances[market][0])
+            quote, base = market.split('-')
+            chance['bid_account'] = copy.deepcopy(self._account(quote))
+            chance['ask_account'] = copy.deepcopy(self._account(base))
+            return chance
+
+    def order(self, market, side, volume, price):
+        '''
+        주문하기
+        주문 결과의 locked 만큼 잔고를 바로 갱신한다.
+        :return: json object (Upbitpy.order 응답)
+        '''
+        generation = self._generation
+        try:
+            ret = self.upbit.order(market, side, volume, price)
+        except Exception:
+            # 잔고 부족 등으로 실패하면 캐시가 실제 잔고와 다를 수 있다.
+            self.invalidate()
+            raise
+        self._apply(ret, generation, 1)
+        return ret
+
+    def cancel_order(self, uuid):
+        '''
+        주문 취소
+        취소 결과의 locked 만큼 잔고를 바로 갱신한다.
+        :return: json object (Upbitpy.cancel_order 응답)
+        '''
+        generation = self._generation
+        ret = self.upbit.cancel_order(uuid)
+        self._apply(ret, generation, -1)
+        return ret
+
+    def invalidate(self, market=None):
+        '''
+        캐시 무효화
+        :param str market: 지정하면 해당 마켓의 주문 가능 정보도 무효화, None 이면 계좌 정보만 무효화
+        '''
+        with self._lock:
+            self._accounts_time = 0
+            if market is not None:
+                self._chances.pop(market, None)
+
+    def refresh(self):
+        '''
+        계좌 정보 다시 조회
+        캐시된 잔고와 다르면 drift 로 기록한다.
+        '''
+        with self._lock:
+            accounts = self.upbit.get_accounts()
+            if self._accounts is not None:
+                self._check_drift(accounts)
+            self._accounts = dict((account['currency'], dict(account)) for account in accounts)
+            self._accounts_time = time.time()
+            self._generation += 1
+
+    ###############################################################
+
+    def _ensure_accounts(self):
+        if self._accounts is None or time.time() - self._accounts_time > self.ttl:
+            self.refresh()
+
+    def _apply(self, ret, generation, sign):
+        with self._lock:
+            if self._accounts is None:
+                return
+            if generation != self._generation:
+                # 주문 중에 다시 조회했으므로 조회 결과에 이미 반영되었을 수 있다.
+                self.invalidate()
+                return
+            quote, base = ret['market'].split('-')
+            account = self._account(quote if ret['side'] == 'bid' else base)
+            locked = float(ret.get('locked') or 0) * sign
+            balance = float(account['balance']) - locked
+            if balance < 0:
+                logging.warning('account drift: %s' % account['currency'])
+                self.drift_count += 1
+                self.invalidate()
+                return
+            account['balance'] = str(balance)
+            account['locked'] = str(float(account['locked']) + locked)
+
+    def _check_drift(self, accounts):
+        for account in accounts:
+            cached = self._accounts.get(account['currency'])
+            if cached is None:
+                continue
+            if float(cached['balance']) != float(account['balance']) or \
+                    float(cached['locked']) != float(account['locked']):
+                logging.info('account drift: %s' % account['currency'])
+                self.drift_count += 1
+
+    def _account(self, currency):
+        if currency not in self._accounts:
+            self._accounts[currency] = {'currency': currency, 'balance': '0.0', 'locked': '0.0',
+                                        'avg_buy_price': '0', 'avg_buy_price_modified': False}
+        return self._accounts[currency]
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+import uuid
+import logging
+from upbitpy.upbitpy import Upbitpy
+
+
+class SimulatedExchange():
+    '''
+    모의 거래소
+    Upbitpy 의 order, cancel_order, get_order, get_orders, get_accounts, get_chance 와
+    같은 형태로 응답하므로 전략 코드를 수정 없이 백테스트할 수 있다.
+    지정가 주문은 feed() 로 들어오는 캔들의 고가/저가에 닿으면 주문 가격으로 전량 체결된다.
+    '''
+
+    DEFAULT_FEE = 0.0005
+    MIN_TOTAL = {'KRW': 5000, 'BTC': 0.0005, 'USDT': 0.5}
+    ORDERS_PER_PAGE = 100
+
+    def __init__(self, balances, fee=DEFAULT_FEE, markets=None):
+        '''
+        Constructor
+        :param dict balances: 초기 잔고 (ex. {'KRW': 1000000})
+        :param float fee: 주문 수수료율, default: 0.0005
+        :param str[] markets: 주문 가능한 마켓 코드 리스트, None 이면 검사하지 않음
+        '''
+        self.fee = fee
+        self.markets = markets
+        self.now = None
+        self.last_prices = dict()
+        self._accounts = dict()
+        self._orders = dict()
+        for currency, balance in balances.items():
+            self._account(currency)['balance'] = float(balance)
+
+    ###############################################################
+    # EXCHANGE API
+    ###############################################################
+
+    def get_accounts(self):
+        '''
+        전체 계좌 조회
+        :return: json array
+        '''
+        return [self._account_json(currency) for currency in self._accounts]
+
+    def get_chance(self, market):
+        '''
+        주문 가능 정보
+        :param str market: Market ID
+        :return: json object
+        '''
+        self._check_market(market)
+        quote, base = market.split('-')
+        return {
+            'bid_fee': str(self.fee),
+            'ask_fee': str(self.fee),
+            'market': {
+                'id': market,
+                'name': '%s/%s' % (base, quote),
+                'order_types': ['limit'],
+                'order_sides': ['ask', 'bid'],
+                'bid': {'currency': quote, 'min_total': self.MIN_TOTAL.get(quote, 0)},
+                'ask': {'currency': base, 'min_total': self.MIN_TOTAL.get(quote, 0)},
+                'state': 'active',
+            },
+            'bid_account': self._account_json(quote),
+            'ask_account': self._account_json(base),
+        }
+
+    def get_order(self, uuid):
+        '''
+        개별 주문 조회
+        :param str uuid: 주문 UUID
+        :return: json object
+        '''
+        if uuid not in self._orders:
+            logging.error('invalid uuid: %s' % uuid)
+            raise Exception('invalid uuid: %s' % uuid)
+        return self._order_json(self._orders[uuid])
+
+    def get_orders(self, market, state, page=1, order_by='asc'):
+        '''
+        주문 리스트 조회
+        :param str market: Market ID
+        :param str state: 주문 상태 (wait, done, cancel)
+        :param int page: 페이지 수, default: 1
+        :param str order_by: 정렬 방식 (asc, desc)
+        :return: json array
+        '''
+        self._check_market(market)
+        if state not in ['wait', 'done', 'cancel']:
+            logging.error('invalid state: %s' % state)
+            raise Exception('invalid state: %s' % state)
+        if order_by not in ['asc', 'desc']:
+            logging.error('invalid order_by: %s' % order_by)
+            raise Exception('invalid order_by: %s' % order_by)
+        orders = [o for o in self._orders.values() if o['market'] == market and o['state'] == state]
+        if order_by == 'desc':
+            orders.reverse()
+        start = (page - 1) * self.ORDERS_PER_PAGE
+        return [self._order_json(o) for o in orders[start:start + self.ORDERS_PER_PAGE]]
+
+    def order(self, market, side, volume, price):
+        '''
+        주문하기 (지정가)
+        :param str market: 마켓 ID
+        :param str side: 주문 종류 (bid, ask)
+        :param volume: 주문량
+        :param price: 유닛당 주문 가격
+        :return: json object
+        '''
+        self._check_market(market)
+        if side not in ['bid', 'ask']:
+            logging.error('invalid side: %s' % side)
+            raise Exception('invalid side: %s' % side)
+        if market.startswith('KRW') and not Upbitpy._is_valid_price(price):
+            logging.error('invalid price: %.2f' % price)
+            raise Exception('invalid price: %.2f' % price)
+
+        quote, base = market.split('-')
+        volume = float(volume)
+        price = float(price)
+        total = volume * price
+        if total < self.MIN_TOTAL.get(quote, 0):
+            logging.error('under min total: %s' % market)
+            raise Exception('under min total: %s' % market)
+
+        if side == 'bid':
+            account = self._account(quote)
+            locked = total * (1 + self.fee)
+        else:
+            account = self._account(base)
+            locked = volume
+        if account['balance'] < locked:
+            logging.error('insufficient funds: %s' % market)
+            raise Exception('insufficient funds: %s' % market)
+        account['balance'] -= locked
+        account['locked'] += locked
+
+        order = {
+            'uuid': str(uuid.uuid4()),
+            'side': side,
+            'price': price,
+            'state': 'wait',
+            'market': market,
+            'created_at': self.now,
+            'volume': volume,
+            'remaining_volume': volume,
+            'reserved_fee': total * self.fee if side == 'bid' else 0.0,
+            'paid_fee': 0.0,
+            'locked': locked,
+            'executed_volume': 0.0,
+        }
+        self._orders[order['uuid']] = order
+        return self._order_json(order)
+
+    def cancel_order(self, uuid):
+        '''
+        주문 취소
+        :param str uuid: 주문 UUID
+        :return: json object
+        '''
+        order = self._orders.get(uuid)
+        if order is None or order['state'] != 'wait':
+            logging.error('order not found: %s' % uuid)
+            raise Exception('order not found: %s' % uuid)
+        quote, base = order['market'].split('-')
+        account = self._account(quote if order['side'] == 'bid' else base)
+        account['locked'] -= order['locked']
+        account['balance'] += order['locked']
+        order['locked'] = 0.0
+        order['state'] = 'cancel'
+        return self._order_json(order)
+
+    ###############################################################
+    # SIMULATION
+    ###############################################################
+
+    def feed(self, market, candle):
+        '''
+        캔들 진행
+        해당 마켓의 대기 주문 중 캔들 가격 범위에 닿은 주문을 체결한다.
+        :param str market: 마켓 코드
+        :param dict candle: get_*_candles 응답의 캔들 하나
+        '''
+        self.now = candle['candle_date_time_utc']
+        self.last_prices[market] = candle['trade_price']
+        for order in list(self._orders.values()):
+            if order['market'] != market or order['state'] != 'wait':
+                continue
+            if order['side'] == 'bid' and candle['low_price'] <= order['price']:
+                self._fill(order)
+            elif order['side'] == 'ask' and candle['high_price'] >= order['price']:
+                self._fill(order)
+
+    def total_value(self, quote='KRW'):
+        '''
+        평가 금액
+        보유 자산을 마지막 캔들 종가 기준 quote 통화로 환산한다.
+        :param str quote: 기준 통화, default: KRW
+        :return: float
+        '''
+        total = 0.0
+        for currency, account in self._accounts.items():
+            amount = account['balance'] + account['locked']
+            if currency == quote:
+                total += amount
+            elif amount > 0:
+                total += amount * self.last_prices.get('%s-%s' % (quote, currency), 0.0)
+        return total
+
+    def _fill(self, order):
+        quote, base = order['market'].split('-')
+        volume = order['remaining_volume']
+        total = volume * order['price']
+        fee = total * self.fee
+        quote_account = self._account(quote)
+        base_account = self._account(base)
+        if order['side'] == 'bid':
+            quote_account['locked'] -= order['locked']
+            quote_account['balance'] += order['locked'] - total - fee
+            held = base_account['balance'] + base_account['locked']
+            base_account['avg_buy_price'] = \
+                (base_account['avg_buy_price'] * held + total) / (held + volume)
+            base_account['balance'] += volume
+        else:
+            base_account['locked'] -= order['locked']
+            quote_account['balance'] += total - fee
+        order['locked'] = 0.0
+        order['paid_fee'] += fee
+        order['executed_volume'] += volume
+        order['remaining_volume'] = 0.0
+        order['state'] = 'done'
+
+    def _check_market(self, market):
+        if self.markets is not None and market not in self.markets:
+            logging.error('invalid market: %s' % market)
+            raise Exception('invalid market: %s' % market)
+
+    def _account(self, currency):
+        if currency not in self._accounts:
+            self._accounts[currency] = {'balance': 0.0, 'locked': 0.0, 'avg_buy_price': 0.0}
+        return self._accounts[currency]
+
+    def _account_json(self, currency):
+        account = self._account(currency)
+        return {
+            'currency': currency,
+            'balance': str(account['balance']),
+            'locked': str(account['locked']),
+            'avg_buy_price': str(account['avg_buy_price']),
+            'avg_buy_price_modified': False,
+        }
+
+    def _order_json(self, order):
+        ret = {'ord_type': 'limit', 'trades_count': 1 if order['state'] == 'done' else 0}
+        for key, value in order.items():
+            ret[key] = str(value) if isinstance(value, float) else value
+        ret['remaining_fee'] = str(order['reserved_fee'] - order['paid_fee']) \
+            if order['state'] == 'wait' else '0.0'
+        return ret
+
+
+def run_backtest(strategy, candles, balances, fee=SimulatedExchange.DEFAULT_FEE):
+    '''
+    백테스트 실행
+    모든 마켓의 캔들을 시간순으로 진행하면서 캔들마다 대기 주문을 체결한 뒤 strategy(exchange, market, candle) 를 호출한다.
+    :param strategy: 전략 함수. exchange 는 Upbitpy 와 같은 주문/조회 함수를 제공한다.
+    :param dict candles: {마켓 코드: 캔들 리스트} (get_*_candles 응답 그대로 사용 가능)
+    :param dict balances: 초기 잔고 (ex. {'KRW': 1000000})
+    :param float fee: 주문 수수료율
+    :return: SimulatedExchange
+    '''
+    return run_batch(lambda params: strategy, candles, [None], balances, fee)[0][1]
+
+
+def run_batch(strategy_factory, candles, param_sets, balances, fee=SimulatedExchange.DEFAULT_FEE):
+    '''
+    여러 파라미터 일괄 백테스트
+    캔들 정렬은 한 번만 하고, 캔들마다 모든 파라미터의 시뮬레이션을 함께 진행한다.
+    :param strategy_factory: 파라미터를 받아 전략 함수를 돌려주는 함수
+    :param dict candles: {마켓 코드: 캔들 리스트}
+    :param list param_sets: 파라미터 리스트
+    :param dict balances: 초기 잔고
+    :param float fee: 주문 수수료율
+    :return: [(params, SimulatedExchange), ...]
+    '''
+    timeline = []
+    for market, market_candles in candles.items():
+        for candle in market_candles:
+            timeline.append((candle['candle_date_time_utc'], market, candle))
+    timeline.sort(key=lambda item: (item[0], item[1]))
+
+    markets = list(candles.keys())
+    runs = [(params, strategy_factory(params), SimulatedExchange(balances, fee, markets))
+            for params in param_sets]
+    for _, market, candle in timeline:
+        for _, strategy, exchange in runs:
+            exchange.feed(market, candle)
+            strategy(exchange, market, candle)
+    return [(params, exchange) for params, _, exchange in runs]
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+import re
+import logging
+from datetime import datetime, timedelta
+
+CANDLE_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+MINUTE_UNITS = [1, 3, 5, 10, 15, 30, 60, 240]
+EPOCH = datetime(1970, 1, 1)
+
+
+class CandleIndex():
+    '''
+    분 캔들 인덱스
+    업비트는 체결이 없는 구간의 캔들을 돌려주지 않는다.
+    (market, unit) 별로 candle_date_time_utc 를 일정 간격의 시간축에 올리고,
+    실제로 조회한 구간(coverage)을 함께 기록하여
+    조회한 구간 안의 빈 캔들(체결 없음)과 조회하지 않은 구간(데이터 gap)을 구분한다.
+    '''
+
+    def __init__(self):
+        self._candles = dict()
+        self._coverage = dict()
+
+    def fetch(self, upbit, market, unit, to=None, count=200):
+        '''
+        분 캔들을 조회하여 인덱스에 추가
+        :param upbit: Upbitpy
+        :param str market: 마켓 코드
+        :param int unit: 분 단위
+        :param str to: 마지막 캔들 시각 (exclusive)
+        :param int count: 캔들 개수
+        :return: json array (get_minutes_candles 응답)
+        '''
+        candles = upbit.get_minutes_candles(unit, market, to=to, count=count)
+        self.add(market, unit, candles, to=to, complete=len(candles) < count)
+        return candles
+
+    def add(self, market, unit, candles, to=None, complete=False):
+        '''
+        캔들 추가
+        candles 는 [가장 오래된 캔들, to) 구간을 빠짐없이 조회한 결과로 간주한다.
+        :param str market: 마켓 코드
+        :param int unit: 분 단위
+        :param list candles: get_minutes_candles 응답
+        :param str to: 조회에 사용한 to 파라미터, None 이면 마지막 캔들까지를 조회 구간으로 본다
+        :param bool complete: True 이면 더 오래된 캔들이 없는 것으로 보고 조회 구간의 시작을 열어둔다
+        '''
+        if unit not in MINUTE_UNITS:
+            logging.error('invalid unit: %s' % str(unit))
+            raise Exception('invalid unit: %s' % str(unit))
+        key = (market, unit)
+        stored = self._candles.setdefault(key, dict())
+        times = []
+        for candle in candles:
+            time = parse_candle_time(candle['candle_date_time_utc'])
+            stored[time] = candle
+            times.append(time)
+        step = timedelta(minutes=unit)
+        if to is not None:
+            end = floor_time(parse_to(to) - timedelta(microseconds=1), unit) + step
+        elif len(times) > 0:
+            end = max(times) + step
+        else:
+            return
+        if complete:
+            start = datetime.min
+        elif len(times) > 0:
+            start = min(times)
+        else:
+            return
+        self._add_coverage(key, start, end)
+
+    def dense(self, market, unit, start=None, end=None):
+        '''
+        일정 간격 캔들 리스트
+        조회 구간 안의 빈 캔들은 직전 종가와 거래량 0 으로 채우고('filled': True), 조회하지 않은 구간은 None 으로 둔다.
+        :param str market: 마켓 코드
+        :param int unit: 분 단위
+        :param datetime start: 시작 시각 (UTC, inclusive), default: 가장 오래된 캔들
+        :param datetime end: 끝 시각 (UTC, exclusive), default: 가장 최근 캔들 다음
+        :return: (시각 리스트, 캔들 리스트) 오름차순
+        '''
+        key = (market, unit)
+        stored = self._candles.get(key, dict())
+        start, end = self._range([key], start, end)
+        step = timedelta(minutes=unit)
+        coverage = self._coverage.get(key, [])
+
+        times = []
+        candles = []
+        last = self._last_before(stored, start)
+        time = start
+        while time < end:
+            candle = stored.get(time)
+            if candle is not None:
+                last = candle
+            elif not _covered(coverage, time):
+                last = None
+            elif last is not None:
+                candle = _fill(last, time)
+            times.append(time)
+            candles.append(candle)
+            time += step
+        return times, candles
+
+    def gaps(self, market, unit, start=None, end=None):
+        '''
+        데이터 gap 조회
+        조회하지 않은 구간 리스트. 조회한 구간 안의 빈 캔들은 gap 이 아니다.
+        :param str market: 마켓 코드
+        :param int unit: 분 단위
+        :param datetime start: 시작 시각 (UTC, inclusive)
+        :param datetime end: 끝 시각 (UTC, exclusive)
+        :return: [(start, end), ...]
+        '''
+        key = (market, unit)
+        start, end = self._range([key], start, end)
+        gaps = []
+        cursor = start
+        for cov_start, cov_end in self._coverage.get(key, []):
+            if cov_end <= cursor:
+                continue
+            if cov_start >= end:
+                break
+            if cov_start > cursor:
+                gaps.append((cursor, cov_start))
+            cursor = max(cursor, cov_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def align(self, markets, unit, start=None, end=None):
+        '''
+        여러 마켓을 같은 시간축으로 정렬
+        :param str[] markets: 마켓 코드 리스트
+        :param int unit: 분 단위
+        :param datetime start: 시작 시각 (UTC, inclusive), default: 모든 마켓 중 가장 오래된 캔들
+        :param datetime end: 끝 시각 (UTC, exclusive), default: 모든 마켓 중 가장 최근 캔들 다음
+        :return: (시각 리스트, {마켓 코드: 캔들 리스트})
+        '''
+        start, end = self._range([(market, unit) for market in markets], start, end)
+        times = None
+        aligned = dict()
+        for market in markets:
+            times, aligned[market] = self.dense(market, unit, start, end)
+        return times, aligned
+
+    def _range(self, keys, start, end):
+        unit = keys[0][1]
+        if start is None or end is None:
+            times = [t for key in keys for t in self._candles.get(key, dict())]
+            if len(times) == 0:
+                logging.error('no candles: %s' % str(keys))
+                raise Exception('no candles: %s' % str(keys))
+            if start is None:
+                start = min(times)
+            if end is None:
+                end = max(times) + timedelta(minutes=unit)
+        return floor_time(start, unit), end
+
+    def _last_before(self, stored, time):
+        before = [t for t in stored if t < time]
+        if len(before) == 0:
+            return None
+        return stored[max(before)]
+
+    def _add_coverage(self, key, start, end):
+        intervals = sorted(self._coverage.get(key, []) + [(start, end)])
+        merged = [intervals[0]]
+        for cov_start, cov_end in intervals[1:]:
+            if cov_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], cov_end))
+            else:
+                merged.append((cov_start, cov_end))
+        self._coverage[key] = merged
+
+
+def parse_candle_time(value):
+    '''
+    candle_date_time_utc 파싱
+    :param str value: ex) 2019-06-06T07:07:00
+    :return: datetime (UTC)
+    '''
+    return datetime.strptime(value[:19], CANDLE_TIME_FORMAT)
+
+
+def parse_to(value):
+    '''
+    캔들 조회 to 파라미터 파싱
+    :param str value: yyyy-MM-dd'T'HH:mm:ssXXX 또는 yyyy-MM-dd HH:mm:ss (UTC)
+    :return: datetime (UTC)
+    '''
+    value = value.strip().replace(' ', 'T')
+    time = datetime.strptime(value[:19], CANDLE_TIME_FORMAT)
+    offset = re.match(r'^([+-])(\d{2}):?(\d{2})$', value[19:])
+    if offset is not None:
+        delta = timedelta(hours=int(offset.group(2)), minutes=int(offset.group(3)))
+        time = time - delta if offset.group(1) == '+' else time + delta
+    return time
+
+
+def floor_time(time, unit):
+    '''
+    분 단위 시작 시각으로 내림
+    :param datetime time: 시각 (UTC)
+    :param int unit: 분 단위
+    :return: datetime
+    '''
+    minutes = int((time - EPOCH).total_seconds() // 60)
+    return EPOCH + timedelta(minutes=minutes - minutes % unit)
+
+
+def _covered(coverage, time):
+    for cov_start, cov_end in coverage:
+        if cov_start <= time < cov_end:
+            return True
+    return False
+
+
+def _fill(last, time):
+    price = last['trade_price']
+    candle = dict(last)
+    candle.update({
+        'candle_date_time_utc': time.strftime(CANDLE_TIME_FORMAT),
+        'candle_date_time_kst': (time + timedelta(hours=9)).strftime(CANDLE_TIME_FORMAT),
+        'opening_price': price,
+        'high_price': price,
+        'low_price': price,
+        'trade_price': price,
+        'candle_acc_trade_price': 0.0,
+        'candle_acc_trade_volume': 0.0,
+        'filled': True,
+    })
+    return candle
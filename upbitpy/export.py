@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+import os
+import csv
+import json
+import logging
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+
+def iter_minutes_candles(upbit, unit, market, to=None, since=None, count=200):
+    '''
+    분 캔들 스트리밍 조회
+    to 부터 과거 방향으로 페이지 단위로 조회하여 캔들을 하나씩 돌려준다.
+    :param upbit: Upbitpy
+    :param int unit: 분 단위
+    :param str market: 마켓 코드
+    :param str to: 마지막 캔들 시각 (exclusive), 비워서 요청시 가장 최근 캔들부터
+    :param str since: 이 시각(candle_date_time_utc, inclusive) 이전 캔들은 조회하지 않음
+    :param int count: 페이지당 캔들 개수 (최대 200)
+    :return: generator of json object
+    '''
+    while True:
+        candles = upbit.get_minutes_candles(unit, market, to=to, count=count)
+        for candle in candles:
+            if since is not None and candle['candle_date_time_utc'] < since:
+                return
+            yield candle
+        if len(candles) < count:
+            return
+        to = candle_cursor(candles[-1])
+
+
+def iter_trades_ticks(upbit, market, cursor=None, count=500):
+    '''
+    체결 내역 스트리밍 조회
+    cursor 부터 과거 방향으로 페이지 단위로 조회하여 체결을 하나씩 돌려준다.
+    :param upbit: Upbitpy
+    :param str market: 마켓 코드
+    :param str cursor: 페이지네이션 커서 (sequential_id), 비워서 요청시 가장 최근 체결부터
+    :param int count: 페이지당 체결 개수
+    :return: generator of json object
+    '''
+    while True:
+        ticks = upbit.get_trades_ticks(market, count=count, cursor=cursor)
+        for tick in ticks:
+            yield tick
+        if len(ticks) == 0:
+            return
+        cursor = trade_cursor(ticks[-1])
+
+
+def candle_cursor(candle):
+    '''
+    이 캔들 이전부터 이어서 조회하기 위한 to 파라미터
+    '''
+    return '%sZ' % candle['candle_date_time_utc']
+
+
+def trade_cursor(tick):
+    '''
+    이 체결 이전부터 이어서 조회하기 위한 cursor 파라미터
+    '''
+    return str(tick['sequential_id'])
+
+
+def export_minutes_candles(upbit, unit, market, directory, to=None, since=None, fmt='csv', count=200,
+                           **kwargs):
+    '''
+    분 캔들 내보내기
+    일정 개수씩 나누어 파일로 쓰므로 기간이 길어도 메모리 사용량이 일정하다.
+    같은 directory 로 다시 호출하면 checkpoint 부터 이어서 내보낸다.
+    :param upbit: Upbitpy
+    :param int unit: 분 단위
+    :param str market: 마켓 코드
+    :param str directory: 저장 디렉터리 (마켓별로 따로 지정)
+    :param str to: 마지막 캔들 시각 (exclusive)
+    :param str since: 이 시각(candle_date_time_utc, inclusive) 까지 내보냄
+    :param str fmt: 'csv' 또는 'parquet'
+    :param int count: 페이지당 캔들 개수
+    :param kwargs: export() 의 batch_size, batches_per_part
+    :return: 내보낸 전체 row 수
+    '''
+    def rows(cursor):
+        return iter_minutes_candles(upbit, unit, market, to=cursor if cursor is not None else to,
+                                    since=since, count=count)
+    return export(rows, candle_cursor, directory, fmt, **kwargs)
+
+
+def export_trades_ticks(upbit, market, directory, cursor=None, fmt='csv', count=500, **kwargs):
+    '''
+    체결 내역 내보내기
+    :param upbit: Upbitpy
+    :param str market: 마켓 코드
+    :param str directory: 저장 디렉터리 (마켓별로 따로 지정)
+    :param str cursor: 시작 커서 (sequential_id)
+    :param str fmt: 'csv' 또는 'parquet'
+    :param int count: 페이지당 체결 개수
+    :param kwargs: export() 의 batch_size, batches_per_part
+    :return: 내보낸 전체 row 수
+    '''
+    def rows(resume):
+        return iter_trades_ticks(upbit, market, cursor=resume if resume is not None else cursor, count=count)
+    return export(rows, trade_cursor, directory, fmt, **kwargs)
+
+
+def export(make_rows, cursor_of, directory, fmt='csv', batch_size=10000, batches_per_part=10):
+    '''
+    스트리밍 내보내기
+    batch_size 개씩 모아 part 파일에 쓰고(parquet 은 batch 하나가 row group 하나),
+    part 파일을 닫을 때마다 마지막 row 의 커서를 checkpoint 로 저장한다.
+    중단 후 다시 호출하면 마지막으로 닫은 part 다음부터 이어서 쓴다.
+    :param make_rows: 커서(None 이면 처음부터)를 받아 row generator 를 돌려주는 함수
+    :param cursor_of: row 를 받아 그 다음부터 이어서 조회하기 위한 커서를 돌려주는 함수
+    :param str directory: 저장 디렉터리
+    :param str fmt: 'csv' 또는 'parquet'
+    :param int batch_size: 한 번에 쓰는 row 수
+    :param int batches_per_part: part 파일 하나에 쓰는 batch 수
+    :return: 내보낸 전체 row 수
+    '''
+    if fmt not in ['csv', 'parquet']:
+        logging.error('invalid fmt: %s' % fmt)
+        raise Exception('invalid fmt: %s' % fmt)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    state = _load_checkpoint(directory)
+    if state['done']:
+        return state['rows']
+
+    writer = None
+    batch = []
+    batches = 0
+    rows = state['rows']
+    for row in make_rows(state['cursor']):
+        batch.append(row)
+        if len(batch) < batch_size:
+            continue
+        if writer is None:
+            writer = _open_part(directory, state['part'], fmt)
+        writer.write(batch)
+        rows += len(batch)
+        batches += 1
+        cursor = cursor_of(batch[-1])
+        batch = []
+        if batches == batches_per_part:
+            writer.close()
+            writer = None
+            batches = 0
+            state = _save_checkpoint(directory, cursor, state['part'] + 1, rows, False)
+
+    if len(batch) > 0:
+        if writer is None:
+            writer = _open_part(directory, state['part'], fmt)
+        writer.write(batch)
+        rows += len(batch)
+    if writer is not None:
+        writer.close()
+    _save_checkpoint(directory, None, state['part'] + 1, rows, True)
+    return rows
+
+
+class CsvPartWriter():
+    '''
+    csv part 파일 writer
+    '''
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(batch[0].keys()), extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerows(batch)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetPartWriter():
+    '''
+    parquet part 파일 writer
+    pyarrow 가 필요하다. (pip install pyarrow)
+    '''
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            logging.error('pyarrow is required for parquet export')
+            raise Exception('pyarrow is required for parquet export')
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(batch)
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            table = self._pa.Table.from_pylist(batch, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _open_part(directory, part, fmt):
+    path = os.path.join(directory, 'part-%05d.%s' % (part, fmt))
+    if fmt == 'parquet':
+        return ParquetPartWriter(path)
+    return CsvPartWriter(path)
+
+
+def _load_checkpoint(directory):
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {'cursor': None, 'part': 0, 'rows': 0, 'done': False}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(directory, cursor, part, rows, done):
+    state = {'cursor': cursor, 'part': part, 'rows': rows, 'done': done}
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(path + '.tmp', path)
+    return state
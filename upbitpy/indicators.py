@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import deque
+from datetime import timedelta
+
+from upbitpy.candle_index import CANDLE_TIME_FORMAT, EPOCH, floor_time
+
+
+class EMA():
+    '''
+    지수 이동 평균
+    처음 period 개 값의 단순 평균으로 시작한다.
+    '''
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, price):
+        if self.value is not None:
+            self.value += self.alpha * (price - self.value)
+            return self.value
+        self._count += 1
+        self._sum += price
+        if self._count == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+    def warmup(self, prices):
+        for price in prices:
+            self.update(price)
+        return self.value
+
+    def snapshot(self):
+        return (self.value, self._count, self._sum)
+
+    def restore(self, snapshot):
+        self.value, self._count, self._sum = snapshot
+
+
+class RSI():
+    '''
+    RSI (Wilder 평활)
+    '''
+
+    def __init__(self, period=14):
+        self.period = period
+        self.value = None
+        self._prev = None
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+
+    def update(self, price):
+        if self._prev is None:
+            self._prev = price
+            return self.value
+        change = price - self._prev
+        self._prev = price
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        if self._count < self.period:
+            self._count += 1
+            self._gain += gain / self.period
+            self._loss += loss / self.period
+            if self._count < self.period:
+                return self.value
+        else:
+            self._gain = (self._gain * (self.period - 1) + gain) / self.period
+            self._loss = (self._loss * (self.period - 1) + loss) / self.period
+        if self._loss == 0:
+            self.value = 100.0 if self._gain > 0 else 50.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+        return self.value
+
+    def warmup(self, prices):
+        for price in prices:
+            self.update(price)
+        return self.value
+
+    def snapshot(self):
+        return (self.value, self._prev, self._count, self._gain, self._loss)
+
+    def restore(self, snapshot):
+        self.value, self._prev, self._count, self._gain, self._loss = snapshot
+
+
+class Bollinger():
+    '''
+    볼린저 밴드
+    구간 합과 제곱합을 갱신하므로 period 와 관계없이 update 비용이 일정하다.
+    부동소수점 오차가 쌓이지 않도록 RESUM_INTERVAL 번마다 구간 합을 다시 계산한다.
+    value 는 (하단, 중심, 상단)
+    '''
+
+    RESUM_INTERVAL = 1000
+
+    def __init__(self, period=20, k=2.0):
+        self.period = period
+        self.k = k
+        self.value = None
+        self._window = deque()
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._updates = 0
+
+    def update(self, price):
+        self._window.append(price)
+        self._sum += price
+        self._sumsq += price * price
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            self._sum -= old
+            self._sumsq -= old * old
+        self._updates += 1
+        if self._updates % self.RESUM_INTERVAL == 0:
+            self._sum = sum(self._window)
+            self._sumsq = sum(p * p for p in self._window)
+        if len(self._window) < self.period:
+            return self.value
+        mean = self._sum / self.period
+        std = math.sqrt(max(self._sumsq / self.period - mean * mean, 0.0))
+        self.value = (mean - self.k * std, mean, mean + self.k * std)
+        return self.value
+
+    def warmup(self, prices):
+        for price in prices:
+            self.update(price)
+        return self.value
+
+    def snapshot(self):
+        # 다음 update() 에서 밀려날 값만 기억하므로 period 와 관계없이 비용이 일정하다.
+        full = len(self._window) == self.period
+        return (self.value, self._sum, self._sumsq, self._updates, self._window[0] if full else None, full)
+
+    def restore(self, snapshot):
+        self.value, self._sum, self._sumsq, self._updates, first, full = snapshot
+        self._window.pop()
+        if full:
+            self._window.appendleft(first)
+
+
+class VWAP():
+    '''
+    거래량 가중 평균 가격
+    reset() 으로 세션을 다시 시작한다.
+    '''
+
+    def __init__(self):
+        self.value = None
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, price, volume):
+        self._price_volume += price * volume
+        self._volume += volume
+        if self._volume > 0:
+            self.value = self._price_volume / self._volume
+        return self.value
+
+    def reset(self):
+        self.value = None
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def set_total(self, price_volume, volume):
+        '''
+        세션 누적 거래대금/거래량으로 설정 (ex. 현재가의 acc_trade_price, acc_trade_volume)
+        '''
+        self._price_volume = price_volume
+        self._volume = volume
+        self.value = price_volume / volume if volume > 0 else None
+        return self.value
+
+    def snapshot(self):
+        return (self.value, self._price_volume, self._volume)
+
+    def restore(self, snapshot):
+        self.value, self._price_volume, self._volume = snapshot
+
+
+class MarketIndicators():
+    '''
+    마켓 하나의 지표 묶음
+    캔들(get_*_candles) 또는 현재가(get_ticker) 를 하나씩 받아 EMA, RSI, 볼린저 밴드, VWAP 을 갱신한다.
+    마지막으로 반영한 캔들과 같은 시각의 캔들(아직 만들어지는 중인 캔들)은 앞서 반영한 값을 되돌리고 다시 반영하며,
+    그보다 이전 시각의 캔들은 무시한다.
+    현재가는 체결 시각이 속한 unit 분 캔들의 종가로 반영하므로 지표의 period 는 현재가를 받아도 캔들 개수 그대로이다.
+    VWAP 은 업비트 일 캔들과 같이 UTC 0시(KST 9시)마다 새로 시작한다.
+    현재가를 받으면 VWAP 은 현재가의 당일 누적 거래대금/거래량(acc_trade_price/acc_trade_volume)으로 계산한다.
+    '''
+
+    def __init__(self, ema_period=20, rsi_period=14, bollinger_period=20, bollinger_k=2.0, unit=1):
+        '''
+        Constructor
+        :param int unit: 캔들 분 단위 (현재가를 반영할 캔들), default: 1
+        '''
+        self.ema = EMA(ema_period)
+        self.rsi = RSI(rsi_period)
+        self.bollinger = Bollinger(bollinger_period, bollinger_k)
+        self.vwap = VWAP()
+        self.unit = unit
+        self._last_candle = None
+        self._last_trade = None
+        self._session = None
+        self._snapshot = None
+
+    def update_candle(self, candle):
+        '''
+        캔들 하나 반영
+        :param dict candle: get_*_candles 응답의 캔들 하나
+        :return: values()
+        '''
+        if not self._begin_candle(candle['candle_date_time_utc']):
+            return self.values()
+        price = candle['trade_price']
+        volume = candle['candle_acc_trade_volume']
+        typical = (candle['high_price'] + candle['low_price'] + price) / 3.0
+        self._update(price)
+        self.vwap.update(typical, volume)
+        return self.values()
+
+    def update_ticker(self, ticker):
+        '''
+        현재가 하나 반영
+        체결 시각이 속한 캔들을 만들어지는 중인 캔들로 보고 종가를 현재가로 바꾼다.
+        :param dict ticker: get_ticker 응답의 항목 하나
+        :return: values()
+        '''
+        timestamp = ticker['trade_timestamp']
+        if self._last_trade is not None and timestamp <= self._last_trade:
+            return self.values()
+        self._last_trade = timestamp
+        time = floor_time(EPOCH + timedelta(milliseconds=timestamp), self.unit).strftime(CANDLE_TIME_FORMAT)
+        if not self._begin_candle(time):
+            return self.values()
+        self._update(ticker['trade_price'])
+        # 폴링 사이의 체결도 모두 반영되도록 거래소가 집계한 당일 누적값을 사용한다.
+        self.vwap.set_total(ticker['acc_trade_price'], ticker['acc_trade_volume'])
+        return self.values()
+
+    def warmup(self, candles):
+        '''
+        과거 캔들 일괄 반영
+        :param list candles: get_*_candles 응답 (최신순이어도 된다)
+        :return: values()
+        '''
+        for candle in sorted(candles, key=lambda c: c['candle_date_time_utc']):
+            self.update_candle(candle)
+        return self.values()
+
+    def values(self):
+        '''
+        :return: {'ema', 'rsi', 'bollinger', 'vwap'} (준비되지 않은 지표는 None)
+        '''
+        return {
+            'ema': self.ema.value,
+            'rsi': self.rsi.value,
+            'bollinger': self.bollinger.value,
+            'vwap': self.vwap.value,
+        }
+
+    def _save(self):
+        return (self.ema.snapshot(), self.rsi.snapshot(), self.bollinger.snapshot(), self.vwap.snapshot())
+
+    def _restore(self):
+        ema, rsi, bollinger, vwap = self._snapshot
+        self.ema.restore(ema)
+        self.rsi.restore(rsi)
+        self.bollinger.restore(bollinger)
+        self.vwap.restore(vwap)
+
+    def _begin_candle(self, time):
+        '''
+        time 캔들을 반영할 준비: 같은 캔들이면 앞서 반영한 값을 되돌리고, 새 캔들이면 세션을 갱신한다.
+        :return: 이전 시각의 캔들이면 False
+        '''
+        if self._last_candle is not None and time < self._last_candle:
+            return False
+        if time == self._last_candle:
+            self._restore()
+        else:
+            self._roll_session(time[:10])
+            self._last_candle = time
+        self._snapshot = self._save()
+        return True
+
+    def _roll_session(self, session):
+        if session != self._session:
+            self._session = session
+            self.vwap.reset()
+
+    def _update(self, price):
+        self.ema.update(price)
+        self.rsi.update(price)
+        self.bollinger.update(price)
+
+
+class IndicatorSet():
+    '''
+    여러 마켓의 지표
+    get_ticker 처럼 여러 마켓을 한 번에 조회한 결과를 그대로 반영한다.
+    '''
+
+    def __init__(self, **kwargs):
+        '''
+        :param kwargs: MarketIndicators 의 파라미터
+        '''
+        self._kwargs = kwargs
+        self.markets = dict()
+
+    def __getitem__(self, market):
+        if market not in self.markets:
+            self.markets[market] = MarketIndicators(**self._kwargs)
+        return self.markets[market]
+
+    def update_candles(self, candles):
+        '''
+        :param list candles: 여러 마켓의 캔들 리스트 (각 캔들의 market 으로 구분)
+        :return: {마켓 코드: values()}
+        '''
+        for candle in sorted(candles, key=lambda c: c['candle_date_time_utc']):
+            self[candle['market']].update_candle(candle)
+        return self.values()
+
+    def update_tickers(self, tickers):
+        '''
+        :param list tickers: get_ticker 응답
+        :return: {마켓 코드: values()}
+        '''
+        for ticker in tickers:
+            self[ticker['market']].update_ticker(ticker)
+        return self.values()
+
+    def warmup(self, candles):
+        '''
+        :param dict candles: {마켓 코드: get_*_candles 응답}
+        :return: {마켓 코드: values()}
+        '''
+        for market, market_candles in candles.items():
+            self[market].warmup(market_candles)
+        return self.values()
+
+    def values(self):
+        return dict((market, indicators.values()) for market, indicators in self.markets.items())
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+import logging
+import threading
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS deposits (
+    uuid TEXT PRIMARY KEY, currency TEXT, state TEXT, amount REAL, fee REAL, created_at TEXT, raw TEXT);
+CREATE INDEX IF NOT EXISTS deposits_currency ON deposits (currency, created_at);
+CREATE TABLE IF NOT EXISTS withdraws (
+    uuid TEXT PRIMARY KEY, currency TEXT, state TEXT, amount REAL, fee REAL, created_at TEXT, raw TEXT);
+CREATE INDEX IF NOT EXISTS withdraws_currency ON withdraws (currency, created_at);
+CREATE TABLE IF NOT EXISTS orders (
+    uuid TEXT PRIMARY KEY, market TEXT, quote TEXT, base TEXT, side TEXT, state TEXT,
+    price REAL, executed_volume REAL, paid_fee REAL, created_at TEXT, raw TEXT,
+    ord_type TEXT, executed_funds REAL);
+CREATE INDEX IF NOT EXISTS orders_market ON orders (market, created_at);
+CREATE INDEX IF NOT EXISTS orders_quote ON orders (quote, created_at);
+CREATE INDEX IF NOT EXISTS orders_base ON orders (base, created_at);
+CREATE TABLE IF NOT EXISTS watermarks (
+    kind TEXT, key TEXT, created_at TEXT, PRIMARY KEY (kind, key));
+'''
+
+# 이전 버전에서 만든 orders 테이블에 추가할 컬럼
+ORDER_COLUMNS = [('ord_type', 'TEXT'), ('executed_funds', 'REAL')]
+
+# 더 이상 상태가 바뀌지 않는 입출금 상태
+DEPOSIT_FINAL_STATES = ['accepted', 'rejected']
+WITHDRAW_FINAL_STATES = ['done', 'rejected', 'canceled']
+
+BALANCE_QUERY = '''
+SELECT created_at, amount - fee AS delta FROM deposits WHERE currency = :currency AND state = 'accepted'
+UNION ALL
+SELECT created_at, -(amount + fee) FROM withdraws WHERE currency = :currency AND state = 'done'
+UNION ALL
+SELECT created_at, CASE side WHEN 'bid' THEN executed_volume ELSE -executed_volume END
+    FROM orders WHERE base = :currency
+UNION ALL
+SELECT created_at, CASE side WHEN 'bid' THEN -(executed_funds + paid_fee)
+                             ELSE executed_funds - paid_fee END
+    FROM orders WHERE quote = :currency
+'''
+
+
+class Ledger():
+    '''
+    입출금/체결 주문 장부
+    get_deposits, get_withraws, get_orders 결과를 sqlite 에 저장하고,
+    종류/통화(마켓)별 watermark 이후의 기록만 다시 조회한다.
+    잔고 추이와 실현 손익은 API 호출 없이 저장된 기록으로 계산한다.
+    주문 금액은 주문 가격이 아니라 실제 체결 금액(executed_funds)이다.
+    지정가 주문도 더 유리한 가격에 체결될 수 있고, 시장가 주문은 price 가 주문 총액이거나 없기 때문이다.
+    체결 금액이 조회 응답에 없으면 체결량이 바뀐 주문만 get_order() 로 체결 내역(trades)을 조회하여 합산한다.
+    '''
+
+    PAGE_LIMIT = 100
+
+    def __init__(self, upbit, path=':memory:'):
+        '''
+        Constructor
+        :param upbit: Upbitpy
+        :param str path: sqlite 파일 경로, default: 메모리
+        '''
+        self.upbit = upbit
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(orders)')]
+        for column, column_type in ORDER_COLUMNS:
+            if column not in columns:
+                self._db.execute('ALTER TABLE orders ADD COLUMN %s %s' % (column, column_type))
+        # 체결 금액 없이 저장된 이전 기록은 주문 가격 * 체결량으로 채운다.
+        self._db.execute('UPDATE orders SET executed_funds = price * executed_volume WHERE executed_funds IS NULL')
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    ###############################################################
+    # SYNC
+    ###############################################################
+
+    def sync(self, currencies=(), markets=()):
+        '''
+        전체 동기화
+        :param str[] currencies: 입출금을 동기화할 통화 리스트
+        :param str[] markets: 체결 주문을 동기화할 마켓 리스트
+        :return: 새로 저장한 기록 수
+        '''
+        count = 0
+        for currency in currencies:
+            count += self.sync_deposits(currency)
+            count += self.sync_withdraws(currency)
+        for market in markets:
+            count += self.sync_orders(market)
+        return count
+
+    def sync_deposits(self, currency):
+        '''
+        입금 동기화
+        :param str currency: Currency 코드
+        :return: 새로 저장한 기록 수
+        '''
+        def fetch(page):
+            return self.upbit.get_deposits(currency, limit=self.PAGE_LIMIT, page=page, order_by='desc')
+        return self._sync('deposits', currency, fetch, self._save_transfer, DEPOSIT_FINAL_STATES)
+
+    def sync_withdraws(self, currency):
+        '''
+        출금 동기화
+        :param str currency: Currency 코드
+        :return: 새로 저장한 기록 수
+        '''
+        def fetch(page):
+            return self.upbit.get_withraws(currency, None, self.PAGE_LIMIT, page=page, order_by='desc')
+        return self._sync('withdraws', currency, fetch, self._save_transfer, WITHDRAW_FINAL_STATES)
+
+    def sync_orders(self, market, states=('wait', 'done', 'cancel')):
+        '''
+        체결 주문 동기화
+        일부 체결 후 취소된 주문도 잔고에 반영되므로 기본으로 cancel 상태도 동기화한다.
+        체결 대기(wait) 주문도 저장해두고, done/cancel 의 watermark 는 가장 오래된 대기 주문 이후로 넘기지 않는다.
+        나중에 체결/취소된 오래된 주문도 다시 조회하기 위함이다.
+        :param str market: Market ID
+        :param str[] states: 동기화할 주문 상태
+        :return: 새로 저장한 기록 수
+        '''
+        count = 0
+        for state in states:
+            def fetch(page, state=state):
+                return self.upbit.get_orders(market, state, page=page, order_by='desc')
+            count += self._sync('orders', '%s:%s' % (market, state), fetch, self._save_order, None)
+        return count
+
+    ###############################################################
+    # QUERY
+    ###############################################################
+
+    def balance_history(self, currency):
+        '''
+        잔고 추이
+        :param str currency: Currency 코드
+        :return: [(created_at, 변화량, 잔고), ...] 시간순
+        '''
+        with self._lock:
+            rows = self._db.execute(BALANCE_QUERY + ' ORDER BY 1', {'currency': currency}).fetchall()
+        history = []
+        balance = 0.0
+        for created_at, delta in rows:
+            balance += delta
+            history.append((created_at, delta, balance))
+        return history
+
+    def balance(self, currency, at=None):
+        '''
+        잔고
+        :param str currency: Currency 코드
+        :param str at: 이 시각(created_at 형식, inclusive) 기준 잔고, None 이면 현재
+        :return: float
+        '''
+        with self._lock:
+            row = self._db.execute(
+                'SELECT COALESCE(SUM(delta), 0) FROM (%s) WHERE :at IS NULL OR created_at <= :at' % BALANCE_QUERY,
+                {'currency': currency, 'at': at}).fetchone()
+        return row[0]
+
+    def realized_pnl(self, market):
+        '''
+        실현 손익 (이동평균 단가 기준)
+        :param str market: Market ID
+        :return: float (quote 통화)
+        '''
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT side, executed_funds, executed_volume, paid_fee FROM orders '
+                'WHERE market = ? AND executed_volume > 0 ORDER BY created_at', (market,)).fetchall()
+        position = 0.0
+        cost = 0.0
+        pnl = 0.0
+        for side, funds, volume, fee in rows:
+            if side == 'bid':
+                position += volume
+                cost += funds + fee
+            elif position > 0:
+                avg = cost / position
+                sold = min(volume, position)
+                pnl += (funds - fee) * sold / volume - avg * sold
+                position -= sold
+                cost -= avg * sold
+        return pnl
+
+    ###############################################################
+
+    def _sync(self, kind, key, fetch, save, final_states):
+        with self._lock:
+            row = self._db.execute('SELECT created_at FROM watermarks WHERE kind = ? AND key = ?',
+                                   (kind, key)).fetchone()
+            watermark = row[0] if row is not None else None
+            inserted = 0
+            page = 1
+            while True:
+                records = fetch(page)
+                for record in records:
+                    if self._db.execute('SELECT 1 FROM %s WHERE uuid = ?' % kind,
+                                        (record['uuid'],)).fetchone() is None:
+                        inserted += 1
+                    save(kind, record)
+                if len(records) < self.PAGE_LIMIT:
+                    break
+                if watermark is not None and records[-1]['created_at'] <= watermark:
+                    break
+                page += 1
+            self._update_watermark(kind, key, final_states)
+            self._db.commit()
+            logging.info('ledger sync %s(%s): %d new' % (kind, key, inserted))
+            return inserted
+
+    def _update_watermark(self, kind, key, final_states):
+        if kind == 'orders':
+            market, state = key.split(':')
+            if state == 'wait':
+                # 대기 주문은 매번 전체를 조회한다.
+                return
+            row = self._db.execute(
+                'SELECT MIN(created_at) FROM ('
+                'SELECT MIN(created_at) AS created_at FROM orders WHERE market = ? AND state = \'wait\' '
+                'UNION ALL SELECT MAX(created_at) FROM orders WHERE market = ? AND state = ?)',
+                (market, market, state)).fetchone()
+        else:
+            # 아직 처리 중인 입출금이 있으면 그 시점부터 다시 조회해야 상태 변화를 반영할 수 있다.
+            marks = ','.join('?' * len(final_states))
+            row = self._db.execute(
+                'SELECT MIN(created_at) FROM %s WHERE currency = ? AND state NOT IN (%s)' % (kind, marks),
+                [key] + final_states).fetchone()
+            if row[0] is None:
+                row = self._db.execute('SELECT MAX(created_at) FROM %s WHERE currency = ?' % kind,
+                                       (key,)).fetchone()
+        if row[0] is not None:
+            self._db.execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)', (kind, key, row[0]))
+
+    def _save_transfer(self, kind, record):
+        self._db.execute('INSERT OR REPLACE INTO %s VALUES (?, ?, ?, ?, ?, ?, ?)' % kind, (
+            record['uuid'], record['currency'], record['state'], float(record['amount']),
+            float(record.get('fee') or 0), record['created_at'], json.dumps(record)))
+
+    def _save_order(self, kind, record):
+        quote, base = record['market'].split('-')
+        volume = float(record.get('executed_volume') or 0)
+        self._db.execute(
+            'INSERT OR REPLACE INTO orders (uuid, market, quote, base, side, state, price, executed_volume, '
+            'paid_fee, created_at, raw, ord_type, executed_funds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                record['uuid'], record['market'], quote, base, record['side'], record['state'],
+                float(record.get('price') or 0), volume, float(record.get('paid_fee') or 0),
+                record['created_at'], json.dumps(record), record.get('ord_type'),
+                self._executed_funds(record, volume)))
+
+    def _executed_funds(self, record, volume):
+        if volume == 0:
+            return 0.0
+        if record.get('executed_funds') is not None:
+            return float(record['executed_funds'])
+        if 'trades' not in record:
+            row = self._db.execute('SELECT executed_volume, executed_funds FROM orders WHERE uuid = ?',
+                                   (record['uuid'],)).fetchone()
+            if row is not None and row[0] == volume and row[1] is not None:
+                return row[1]
+            record = self.upbit.get_order(record['uuid'])
+        return sum(float(trade['funds']) for trade in record.get('trades') or [])
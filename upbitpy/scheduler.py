@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import time
+import itertools
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from upbitpy.transport import get_transport
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_ACCOUNT = 2
+PRIORITY_QUOTATION = 3
+
+# 요청 그룹별 초당 요청 수 제한
+# https://docs.upbit.com/docs/user-request-guide
+DEFAULT_LIMITS = {
+    'order': 8,
+    'default': 30,
+    'market': 10,
+    'candles': 10,
+    'ticker': 10,
+    'trades': 10,
+    'orderbook': 10,
+}
+
+# 요청 그룹별 분당 요청 수 제한
+DEFAULT_MINUTE_LIMITS = {
+    'order': 200,
+    'default': 900,
+    'market': 600,
+    'candles': 600,
+    'ticker': 600,
+    'trades': 600,
+    'orderbook': 600,
+}
+
+QUOTATION_GROUPS = [
+    ('/v1/market', 'market'),
+    ('/v1/candles', 'candles'),
+    ('/v1/ticker', 'ticker'),
+    ('/v1/trades', 'trades'),
+    ('/v1/orderbook', 'orderbook'),
+]
+
+
+def classify(method, url):
+    '''
+    요청 분류
+    :param str method: HTTP method
+    :param str url: 요청 URL
+    :return: (우선순위, 요청 그룹)
+    '''
+    path = urlparse(url).path
+    for prefix, group in QUOTATION_GROUPS:
+        if path.startswith(prefix):
+            return PRIORITY_QUOTATION, group
+    if method.upper() == 'DELETE' and path == '/v1/order':
+        return PRIORITY_CANCEL, 'default'
+    if method.upper() == 'POST' and path == '/v1/orders':
+        return PRIORITY_ORDER, 'order'
+    return PRIORITY_ACCOUNT, 'default'
+
+
+class RequestScheduler():
+    '''
+    우선순위 요청 scheduler (transport)
+    요청을 취소 > 주문 > 계좌 > 시세 순서로 내보내고, 요청 그룹별 초당/분당 요청 수를 넘지 않도록 대기시킨다.
+    같은 우선순위에서는 지금까지 적게 요청한 마켓부터 내보낸다.
+    동시에 보내는 요청 수를 max_concurrency 로 제한하므로 시세 조회가 몰려도 주문/취소가 먼저 나간다.
+    '''
+
+    def __init__(self, transport=None, limits=None, max_concurrency=4, minute_limits=None):
+        '''
+        Constructor
+        :param transport: 실제 요청을 보낼 transport 객체 또는 이름, default: requests
+        :param dict limits: 요청 그룹별 초당 요청 수, default: DEFAULT_LIMITS
+        :param int max_concurrency: 동시에 보내는 최대 요청 수
+        :param dict minute_limits: 요청 그룹별 분당 요청 수, default: DEFAULT_MINUTE_LIMITS
+        '''
+        self.transport = get_transport(transport)
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits is not None:
+            self.limits.update(limits)
+        self.minute_limits = dict(DEFAULT_MINUTE_LIMITS)
+        if minute_limits is not None:
+            self.minute_limits.update(minute_limits)
+        self.max_concurrency = max_concurrency
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._served = defaultdict(int)
+        self._windows = dict()
+        self._minute_windows = dict()
+        self._in_flight = 0
+        self._seq = itertools.count()
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        priority, group = classify(method, url)
+        market = _market_of(data, params)
+        with self._cond:
+            ticket = (priority, next(self._seq), group, market)
+            self._waiting.append(ticket)
+            while True:
+                wait = self._wait_time(ticket)
+                if wait == 0:
+                    break
+                self._cond.wait(wait)
+            self._waiting.remove(ticket)
+            self._window(group)[1] += 1
+            self._minute_window(group)[1] += 1
+            self._served[market] += 1
+            self._in_flight += 1
+            # 동시 요청 수가 남았으면 다음 ticket 도 바로 나갈 수 있다.
+            self._cond.notify_all()
+        try:
+            resp = self.transport.request(method, url, headers=headers, data=data, params=params)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+        self._update_remaining(resp)
+        return resp
+
+    def close(self):
+        if hasattr(self.transport, 'close'):
+            self.transport.close()
+
+    ###############################################################
+
+    def _wait_time(self, ticket):
+        '''
+        ticket 이 지금 나갈 수 있으면 0, 아니면 대기 시간 (None 이면 다른 요청이 끝날 때까지)
+        '''
+        if self._in_flight >= self.max_concurrency:
+            return None
+        wait = self._budget_wait(ticket[2])
+        if wait > 0:
+            return wait
+        return 0 if self._next_ticket() is ticket else None
+
+    def _next_ticket(self):
+        '''
+        지금 내보낼 ticket (요청 한도가 남은 것 중 우선순위 > 현재까지 마켓별 요청 수 > 대기 순서)
+        마켓별 요청 수를 내보낼 때 비교하므로 한 마켓의 요청이 몰려도 다른 마켓과 번갈아 나간다.
+        '''
+        best = None
+        for ticket in self._waiting:
+            if self._budget_wait(ticket[2]) > 0:
+                continue
+            key = (ticket[0], self._served[ticket[3]], ticket[1])
+            if best is None or key < best[0]:
+                best = (key, ticket)
+        return best[1] if best is not None else None
+
+    def _budget_wait(self, group):
+        wait = 0
+        for window, limit, length in [(self._window(group), self.limits, 1.0),
+                                      (self._minute_window(group), self.minute_limits, 60.0)]:
+            if window[1] >= limit.get(group, limit['default']):
+                wait = max(wait, window[0] + length - time.monotonic(), 0.001)
+        return wait
+
+    def _window(self, group):
+        return _window(self._windows, group, 1.0)
+
+    def _minute_window(self, group):
+        return _window(self._minute_windows, group, 60.0)
+
+    def _update_remaining(self, resp):
+        # 서버가 알려준 남은 요청 수가 더 적으면 그에 맞춘다.
+        remaining = resp.headers.get('Remaining-Req') if resp.headers is not None else None
+        if remaining is None:
+            return
+        keyval = dict(kv.split('=', 1) for kv in remaining.split('; ') if '=' in kv)
+        if 'group' not in keyval or 'sec' not in keyval:
+            return
+        group = keyval['group']
+        with self._cond:
+            window = self._window(group)
+            limit = self.limits.get(group, self.limits['default'])
+            window[1] = max(window[1], limit - int(keyval['sec']))
+            if 'min' in keyval:
+                # 분당 한도를 다 쓰면 서버는 초당 한도가 남아도 429 를 돌려준다.
+                window = self._minute_window(group)
+                limit = self.minute_limits.get(group, self.minute_limits['default'])
+                window[1] = max(window[1], limit - int(keyval['min']))
+            self._cond.notify_all()
+
+
+def _window(windows, group, length):
+    now = time.monotonic()
+    window = windows.get(group)
+    if window is None or now - window[0] >= length:
+        window = [now, 0]
+        windows[group] = window
+    return window
+
+
+def _market_of(data, params):
+    for values in [data, params]:
+        if not values:
+            continue
+        if 'market' in values:
+            return values['market']
+        if 'markets' in values:
+            return values['markets'].split(',')[0]
+    return None
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import hmac
+import json
+import uuid
+import base64
+import hashlib
+from urllib.parse import urlencode, unquote
+
+JWT_HEADER = {'alg': 'HS256', 'typ': 'JWT'}
+
+
+class Signer():
+    '''
+    인증 토큰(JWT, HS256) 생성
+    고정된 JWT header 와 HMAC key 를 미리 준비해두고 요청마다 payload 만 서명한다.
+    파라미터가 있으면 query 대신 query_hash(SHA512), query_hash_alg 를 보낸다.
+    nonce 는 uuid4 이므로 여러 thread 에서 동시에 사용해도 겹치지 않는다.
+    https://docs.upbit.com/docs/create-authorization-request
+    '''
+
+    def __init__(self, access_key, secret):
+        '''
+        Constructor
+        :param str access_key: 발급 받은 acccess key
+        :param str secret: 발급 받은 secret
+        '''
+        self.access_key = access_key
+        self._header = _b64encode(_dumps(JWT_HEADER)) + b'.'
+        self._mac = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+
+    def sign(self, query=None):
+        '''
+        토큰 생성
+        :param dict query: 요청 파라미터 (배열 파라미터는 {'uuids[]': [...]} 형식)
+        :return: str
+        '''
+        payload = {
+            'access_key': self.access_key,
+            'nonce': str(uuid.uuid4()),
+        }
+        if query:
+            payload['query_hash'] = hashlib.sha512(query_string(query).encode('utf-8')).hexdigest()
+            payload['query_hash_alg'] = 'SHA512'
+        signing_input = self._header + _b64encode(_dumps(payload))
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return (signing_input + b'.' + _b64encode(mac.digest())).decode('ascii')
+
+    def headers(self, query=None):
+        '''
+        인증 헤더
+        :param dict query: 요청 파라미터
+        :return: dict
+        '''
+        return {'Authorization': 'Bearer %s' % self.sign(query)}
+
+
+def query_string(query):
+    '''
+    query_hash 계산에 사용하는 query string
+    배열 파라미터는 key 를 반복한다. (ex. uuids[]=a&uuids[]=b)
+    :param dict query: 요청 파라미터
+    :return: str
+    '''
+    return unquote(urlencode(query, doseq=True))
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import time
+import logging
+
+QUOTES = ['KRW', 'BTC', 'USDT']
+MAX_MARKETS_PER_REQUEST = 100
+
+
+class Snapshot():
+    '''
+    여러 마켓의 현재가/호가 스냅샷
+    captured_at 은 조회 시작과 끝의 중간 시각이고, skew 는 조회에 걸린 시간으로
+    마켓 간 조회 시점 차이의 상한이다.
+    '''
+
+    def __init__(self, tickers, orderbooks, started_at, finished_at):
+        self.tickers = tickers
+        self.orderbooks = orderbooks
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.captured_at = (started_at + finished_at) / 2.0
+        self.skew = finished_at - started_at
+
+    def price(self, market):
+        '''
+        마켓 가격
+        호가가 있으면 최우선 매수/매도 호가의 중간값, 없으면 현재가
+        :param str market: 마켓 코드
+        :return: float
+        '''
+        orderbook = self.orderbooks.get(market)
+        if orderbook is not None and len(orderbook['orderbook_units']) > 0:
+            unit = orderbook['orderbook_units'][0]
+            return (unit['ask_price'] + unit['bid_price']) / 2.0
+        return self.tickers[market]['trade_price']
+
+    def staleness(self, market):
+        '''
+        마지막 체결 이후 경과 시간 (초)
+        :param str market: 마켓 코드
+        :return: float
+        '''
+        return self.finished_at - self.tickers[market]['trade_timestamp'] / 1000.0
+
+    def cross_rates(self, quotes=QUOTES):
+        '''
+        교차 환율
+        모든 (기준 통화, 경유 통화) 삼각형에 대해 경유 마켓 가격 * 기준/경유 마켓 가격으로 구한 가격과
+        직접 마켓 가격을 비교한다. staleness 는 삼각형을 이루는 세 마켓 중 가장 오래된 체결 기준이다.
+        ex) KRW-XRP 의 implied = BTC-XRP * KRW-BTC, premium = KRW-XRP / implied - 1
+        :param str[] quotes: 기준 통화 리스트
+        :return: [{'base', 'quote', 'via', 'direct', 'implied', 'premium', 'staleness'}, ...]
+        '''
+        bases = _bases_by_quote(self.tickers.keys())
+        prices = dict((market, self.price(market)) for market in self.tickers)
+        rates = []
+        for quote, via, cross, cross_market in _triangles(prices, quotes):
+            for base in bases.get(quote, set()) & bases.get(via, set()):
+                direct = prices['%s-%s' % (quote, base)]
+                implied = prices['%s-%s' % (via, base)] * cross
+                rates.append({
+                    'base': base,
+                    'quote': quote,
+                    'via': via,
+                    'direct': direct,
+                    'implied': implied,
+                    'premium': direct / implied - 1.0,
+                    'staleness': max(self.staleness('%s-%s' % (quote, base)),
+                                     self.staleness('%s-%s' % (via, base)),
+                                     self.staleness(cross_market)),
+                })
+        return rates
+
+
+def related_markets(markets, quotes=QUOTES):
+    '''
+    교차 비교가 가능한 마켓
+    둘 이상의 기준 통화로 거래되는 코인의 마켓과 기준 통화 간 마켓 (ex. KRW-BTC, USDT-BTC)
+    :param str[] markets: 마켓 코드 리스트 (ex. Upbitpy.markets)
+    :param str[] quotes: 기준 통화 리스트
+    :return: str[]
+    '''
+    bases = _bases_by_quote(markets)
+    related = set()
+    for market in markets:
+        quote, base = market.split('-')
+        if quote not in quotes:
+            continue
+        if base in quotes:
+            related.add(market)
+            continue
+        if sum(1 for q in quotes if base in bases.get(q, set())) >= 2:
+            related.add(market)
+    return sorted(related)
+
+
+def take_snapshot(upbit, quotes=QUOTES, orderbook=False, markets=None):
+    '''
+    스냅샷 조회
+    관련 마켓을 MAX_MARKETS_PER_REQUEST 개씩 묶어 get_ticker(와 get_orderbook) 를 최소 횟수로 호출한다.
+    :param upbit: Upbitpy
+    :param str[] quotes: 기준 통화 리스트
+    :param bool orderbook: True 이면 호가도 조회하여 가격을 호가 중간값으로 계산
+    :param str[] markets: 조회할 마켓 리스트, default: related_markets(upbit.markets, quotes)
+    :return: Snapshot
+    '''
+    if markets is None:
+        markets = related_markets(upbit.markets, quotes)
+    if len(markets) == 0:
+        logging.error('no related markets: %s' % str(quotes))
+        raise Exception('no related markets: %s' % str(quotes))
+
+    chunks = [markets[i:i + MAX_MARKETS_PER_REQUEST] for i in range(0, len(markets), MAX_MARKETS_PER_REQUEST)]
+    tickers = dict()
+    orderbooks = dict()
+    started_at = time.time()
+    for chunk in chunks:
+        for ticker in upbit.get_ticker(chunk):
+            tickers[ticker['market']] = ticker
+    if orderbook:
+        for chunk in chunks:
+            for item in upbit.get_orderbook(chunk):
+                orderbooks[item['market']] = item
+    finished_at = time.time()
+    return Snapshot(tickers, orderbooks, started_at, finished_at)
+
+
+def _bases_by_quote(markets):
+    bases = dict()
+    for market in markets:
+        quote, base = market.split('-')
+        bases.setdefault(quote, set()).add(base)
+    return bases
+
+
+def _triangles(prices, quotes):
+    '''
+    (기준 통화, 경유 통화, 경유 통화 1단위의 기준 통화 가격, 그 가격을 구한 마켓)
+    '''
+    for quote in quotes:
+        for via in quotes:
+            if quote == via:
+                continue
+            market = '%s-%s' % (quote, via)
+            if market in prices:
+                yield quote, via, prices[market], market
+                continue
+            market = '%s-%s' % (via, quote)
+            if market in prices:
+                yield quote, via, 1.0 / prices[market], market
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+import os
+import gzip
+import json
+import time
+import zlib
+import logging
+import threading
+from collections import defaultdict, deque
+
+import requests
+
+
+class TransportResponse():
+    '''
+    transport 가 돌려주는 응답
+    Upbitpy 는 status_code, text, headers 만 사용하므로 requests.Response 와 호환된다.
+    '''
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers if headers is not None else {}
+
+
+class RequestsTransport():
+    '''
+    requests 를 사용하는 기본 transport
+    Session 을 재사용하므로 같은 호스트로의 연결을 keep-alive 로 유지한다.
+    '''
+
+    def __init__(self):
+        self._session = requests.Session()
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        return self._session.request(method, url, headers=headers, data=data, params=params)
+
+    def close(self):
+        self._session.close()
+
+
+class Http2Transport():
+    '''
+    HTTP/2 transport
+    httpx 가 필요하다. (pip install httpx[http2])
+    하나의 연결에서 여러 요청을 multiplexing 하므로 여러 thread 에서 동시에 시세 조회를 할 때 유리하다.
+    '''
+
+    def __init__(self, max_connections=10, timeout=10.0):
+        '''
+        :param int max_connections: 최대 연결 수
+        :param float timeout: 요청 timeout (초)
+        '''
+        try:
+            import httpx
+        except ImportError:
+            logging.error('httpx is required for http2 transport')
+            raise Exception('httpx is required for http2 transport')
+        self._client = httpx.Client(http2=True, timeout=timeout,
+                                    limits=httpx.Limits(max_connections=max_connections))
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        return self._client.request(method, url, headers=headers, data=data, params=params)
+
+    def close(self):
+        self._client.close()
+
+
+class MemoryTransport():
+    '''
+    메모리 transport (테스트용)
+    add_response() 로 등록한 응답을 돌려주고, 받은 요청은 requests 에 기록한다.
+    '''
+
+    def __init__(self):
+        self.requests = []
+        self._routes = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def add_response(self, url, body, method='GET', status_code=200, headers=None):
+        '''
+        응답 등록
+        같은 요청에 여러 응답을 등록하면 순서대로 돌려주고, 마지막 응답은 계속 돌려준다.
+        :param str url: 요청 URL
+        :param body: 응답 body (str 이 아니면 json 으로 변환)
+        :param str method: HTTP method, default: GET
+        :param int status_code: 응답 코드, default: 200
+        :param dict headers: 응답 헤더 (ex. {'Remaining-Req': 'group=market; min=599; sec=9'})
+        '''
+        text = body if isinstance(body, str) else json.dumps(body)
+        with self._lock:
+            self._routes[(method.upper(), url)].append(TransportResponse(status_code, text, headers))
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        with self._lock:
+            self.requests.append({'method': method, 'url': url, 'headers': headers,
+                                  'data': data, 'params': params})
+            responses = self._routes.get((method.upper(), url))
+            if not responses:
+                logging.error('no response registered: %s %s' % (method, url))
+                raise Exception('no response registered: %s %s' % (method, url))
+            if len(responses) > 1:
+                return responses.popleft()
+            return responses[0]
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'http2': Http2Transport,
+}
+
+
+def get_transport(transport=None):
+    '''
+    transport 선택
+    :param transport: transport 객체 또는 이름 (requests, http2), default: requests
+    :return: transport
+    '''
+    if transport is None:
+        return RequestsTransport()
+    if not isinstance(transport, str):
+        return transport
+    if transport not in TRANSPORTS:
+        logging.error('invalid transport: %s' % transport)
+        raise Exception('invalid transport: %s' % transport)
+    return TRANSPORTS[transport]()
+
+
+class RecordingTransport():
+    '''
+    요청/응답 기록 transport
+    내부 transport 로 요청을 보내고 요청/응답을 gzip 으로 압축된 json lines 로그에 덧붙인다.
+    Authorization 등 비밀 정보가 담긴 헤더는 기록하지 않는다.
+    기록은 실행(session)마다 새 segment 파일(path, path.1, path.2, ...)에 쓰므로
+    이전 실행이 비정상 종료되어 segment 끝이 잘려도 이후 기록에는 영향이 없다.
+    '''
+
+    SECRET_HEADERS = ['authorization']
+
+    def __init__(self, path, transport=None):
+        '''
+        :param str path: 기록 파일 경로
+        :param transport: 실제 요청을 보낼 transport, default: RequestsTransport
+        '''
+        self.path = path
+        self.transport = transport if transport is not None else RequestsTransport()
+        self._lock = threading.Lock()
+        self._file = None
+        self.segment_path = None
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        start = time.time()
+        resp = self.transport.request(method, url, headers=headers, data=data, params=params)
+        elapsed = time.time() - start
+        record = {
+            'time': start,
+            'elapsed': elapsed,
+            'method': method,
+            'url': url,
+            'params': params,
+            'data': data,
+            'headers': self._strip_secrets(headers),
+            'status_code': resp.status_code,
+            'text': resp.text,
+            'remaining_req': resp.headers.get('Remaining-Req'),
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._file is None:
+                self.segment_path = _next_segment(self.path)
+                self._file = gzip.open(self.segment_path, 'wb')
+            self._file.write(line.encode('utf-8'))
+            # 요청마다 flush 하므로 비정상 종료되어도 앞선 기록은 읽을 수 있다.
+            self._file.flush()
+        return resp
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _strip_secrets(self, headers):
+        if headers is None:
+            return None
+        return {k: v for k, v in headers.items() if k.lower() not in self.SECRET_HEADERS}
+
+
+class ReplayTransport():
+    '''
+    기록 재생 transport
+    RecordingTransport 로 기록한 응답을 네트워크 없이 돌려준다.
+    같은 (method, url, params, data) 요청은 기록된 순서대로 응답한다.
+    '''
+
+    def __init__(self, path, pace=False):
+        '''
+        :param str path: 기록 파일 경로
+        :param bool pace: True 이면 기록 당시의 요청 간격만큼 대기, False 이면 대기 없이 재생
+        '''
+        self.pace = pace
+        self._lock = threading.Lock()
+        self._records = defaultdict(deque)
+        self._origin = None
+        self._started = None
+        for record in read_records(path):
+            if self._origin is None:
+                self._origin = record['time']
+            key = self._key(record['method'], record['url'], record['params'], record['data'])
+            self._records[key].append(record)
+
+    def request(self, method, url, headers=None, data=None, params=None):
+        key = self._key(method, url, params, data)
+        with self._lock:
+            if len(self._records[key]) == 0:
+                logging.error('no recorded response: %s %s' % (method, url))
+                raise Exception('no recorded response: %s %s' % (method, url))
+            record = self._records[key].popleft()
+            if self._started is None:
+                self._started = time.time()
+        if self.pace:
+            delay = (record['time'] + record['elapsed'] - self._origin) - (time.time() - self._started)
+            if delay > 0:
+                time.sleep(delay)
+        resp_headers = {}
+        if record['remaining_req'] is not None:
+            resp_headers['Remaining-Req'] = record['remaining_req']
+        return TransportResponse(record['status_code'], record['text'], resp_headers)
+
+    def remaining(self):
+        '''
+        아직 재생되지 않은 기록 수
+        :return: int
+        '''
+        with self._lock:
+            return sum(len(records) for records in self._records.values())
+
+    def _key(self, method, url, params, data):
+        return (method.upper(), url,
+                json.dumps(params, sort_keys=True, default=str),
+                json.dumps(data, sort_keys=True, default=str))
+
+
+def read_records(path):
+    '''
+    기록 파일 읽기
+    path 와 이어지는 segment 파일(path.1, path.2, ...)을 순서대로 읽는다.
+    :param str path: RecordingTransport 기록 파일 경로
+    :return: generator of dict
+    '''
+    for segment in _segments(path):
+        with gzip.open(segment, 'rb') as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    yield json.loads(line.decode('utf-8'))
+            except (EOFError, OSError, zlib.error, ValueError):
+                # close() 없이 종료된 segment: flush 된 부분까지만 읽는다.
+                logging.warning('truncated record file: %s' % segment)
+
+
+def _segments(path):
+    segments = []
+    if os.path.exists(path):
+        segments.append(path)
+    index = 1
+    while os.path.exists('%s.%d' % (path, index)):
+        segments.append('%s.%d' % (path, index))
+        index += 1
+    return segments
+
+
+def _next_segment(path):
+    if not os.path.exists(path):
+        return path
+    index = 1
+    while os.path.exists('%s.%d' % (path, index)):
+        index += 1
+    return '%s.%d' % (path, index)
@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 import json
-import time
-import requests
-import jwt
 import logging
 from datetime import datetime
-from urllib.parse import urlencode
+from upbitpy.transport import get_transport
+from upbitpy.scheduler import RequestScheduler
+from upbitpy.signer import Signer
 
 
 class Upbitpy():
@@ -14,15 +13,21 @@ class Upbitpy():
     https://docs.upbit.com/v1.0/reference
     """
 
-    def __init__(self, access_key=None, secret=None):
+    def __init__(self, access_key=None, secret=None, transport=None, scheduled=False):
         '''
         Constructor
         access_key, secret이 없으면 인증가능 요청(EXCHANGE API)은 사용할 수 없음
         :param str access_key: 발급 받은 acccess key
         :param str secret: 발급 받은 secret
+        :param transport: 요청을 보낼 transport 객체 또는 이름 (requests, http2), default: requests
+        :param bool scheduled: True 이면 RequestScheduler 로 취소 > 주문 > 계좌 > 시세 순서로 요청을 보냄
         '''
         self.access_key = access_key
         self.secret = secret
+        self.signer = Signer(access_key, secret) if access_key is not None and secret is not None else None
+        self.transport = get_transport(transport)
+        if scheduled:
+            self.transport = RequestScheduler(self.transport)
         self.remaining_req = dict()
         self.markets = self._load_markets()
 
@@ -156,7 +161,7 @@ class Upbitpy():
         data = {'uuid': uuid}
         return self._delete(URL, self._get_headers(data), data)
 
-    def get_withraws(self, currency, state, limit):
+    def get_withraws(self, currency, state, limit, page=None, order_by=None):
         '''
         출금 리스트 조회
         https://docs.upbit.com/v1.0/reference#%EC%A0%84%EC%B2%B4-%EC%B6%9C%EA%B8%88-%EC%A1%B0%ED%9A%8C
@@ -171,6 +176,8 @@ class Upbitpy():
             done : 완료
             canceled : 취소됨
         :param int limit: 갯수 제한
+        :param int page: 페이지 번호
+        :param str order_by: 정렬 방식
         :return: json array
         '''
         LIMIT_MAX = 100
@@ -190,6 +197,10 @@ class Upbitpy():
                 logging.error('invalid limit(%d)' % limit)
                 raise Exception('invalid limit(%d)' % limit)
             data['limit'] = limit
+        if page is not None:
+            data['page'] = page
+        if order_by is not None:
+            data['order_by'] = order_by
         return self._get(URL, self._get_headers(data), data)
 
     def get_withraw(self, uuid):
@@ -473,9 +484,10 @@ class Upbitpy():
     ###############################################################
 
     def _update_remaining_req(self, resp):
-        if 'Remaining-Req' not in resp.headers.keys():
+        remaining = resp.headers.get('Remaining-Req')
+        if remaining is None:
             return None
-        keyvals = resp.headers['Remaining-Req'].split('; ')
+        keyvals = remaining.split('; ')
         group = None
         keyval = dict()
         for _keyval in keyvals:
@@ -491,7 +503,7 @@ class Upbitpy():
 
 
     def _get(self, url, headers=None, data=None, params=None):
-        resp = requests.get(url, headers=headers, data=data, params=params)
+        resp = self.transport.request('GET', url, headers=headers, data=data, params=params)
         if resp.status_code not in [200, 201]:
             logging.error('get(%s) failed(%d)' % (url, resp.status_code))
             if resp.text is not None:
@@ -503,7 +515,7 @@ class Upbitpy():
         return json.loads(resp.text)
 
     def _post(self, url, headers, data):
-        resp = requests.post(url, headers=headers, data=data)
+        resp = self.transport.request('POST', url, headers=headers, data=data)
         if resp.status_code not in [200, 201]:
             logging.error('post(%s) failed(%d)' % (url, resp.status_code))
             if resp.text is not None:
@@ -514,7 +526,7 @@ class Upbitpy():
         return json.loads(resp.text)
 
     def _delete(self, url, headers, data):
-        resp = requests.delete(url, headers=headers, data=data)
+        resp = self.transport.request('DELETE', url, headers=headers, data=data)
         if resp.status_code not in [200, 201]:
             logging.error('delete(%s) failed(%d)' % (url, resp.status_code))
             if resp.text is not None:
@@ -538,19 +550,17 @@ class Upbitpy():
             raise Exception(e)
 
     def _get_token(self, query):
-        payload = {
-            'access_key': self.access_key,
-            'nonce': int(time.time() * 1000),
-        }
-        if query is not None:
-            payload['query'] = urlencode(query)
-        return jwt.encode(payload, self.secret, algorithm='HS256').decode('utf-8')
+        if self.signer is None:
+            logging.error('access_key and secret are required')
+            raise Exception('access_key and secret are required')
+        return self.signer.sign(query)
 
     def _get_headers(self, query=None):
         headers = {'Authorization': 'Bearer %s' % self._get_token(query)}
         return headers
 
-    def _is_valid_price(self, price):
+    @staticmethod
+    def _is_valid_price(price):
         '''
         원화 마켓 주문 가격 단위
         원화 마켓은 호가 별 주문 가격의 단위가 다릅니다. 아래 표를 참고하여 해당 단위로 주문하여 주세요.